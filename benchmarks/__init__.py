@@ -0,0 +1,8 @@
+"""
+Benchmarks of RESPX's own overhead, offline and with fixed random seeds.
+
+    $ python -m benchmarks --quick
+    $ python -m benchmarks -s routing --sizes 10,1000 -o after.json --compare before.json
+
+Results are saved as JSON, with seconds per operation for each repeat.
+"""
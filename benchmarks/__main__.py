@@ -0,0 +1,118 @@
+import argparse
+import datetime
+import json
+import platform
+import random
+import sys
+from typing import Any, Dict, List
+
+import httpx
+
+import respx
+
+from . import mocking, patterns, routing
+from .utils import Result
+
+SUITES = ("routing", "patterns", "mocking")
+SIZES = (10, 100, 1000, 10000, 100000)
+QUICK_SIZES = (10, 100, 1000)
+
+
+def parse_args(args: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description="Benchmark RESPX overhead."
+    )
+    parser.add_argument(
+        "-s",
+        "--suite",
+        dest="suites",
+        action="append",
+        choices=SUITES,
+        help="suite to run, repeatable, default all",
+    )
+    parser.add_argument(
+        "--sizes",
+        type=lambda value: tuple(int(size) for size in value.split(",")),
+        help=f"comma separated route counts, default {','.join(map(str, SIZES))}",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="random seed, default 0")
+    parser.add_argument("--repeat", type=int, default=5, help="repeats per benchmark")
+    parser.add_argument(
+        "--min-time", type=float, default=0.05, help="min seconds per repeat"
+    )
+    parser.add_argument(
+        "--quick", action="store_true", help="run fewer and shorter benchmarks"
+    )
+    parser.add_argument(
+        "-o", "--output", default="benchmark.json", help="JSON results file"
+    )
+    parser.add_argument("--compare", help="JSON results file to compare with")
+    options = parser.parse_args(args)
+
+    if options.quick:
+        options.sizes = options.sizes or QUICK_SIZES
+        options.repeat = 3
+        options.min_time = 0.01
+
+    options.sizes = options.sizes or SIZES
+    options.suites = options.suites or SUITES
+    return options
+
+
+def compare(results: List[Result], filename: str) -> None:
+    """
+    Prints median change per benchmark, compared with a previous results file.
+    """
+    with open(filename) as f:
+        previous = {
+            Result(**{k: v for k, v in result.items() if k in Result._fields}).key: (
+                result["median"]
+            )
+            for result in json.load(f)["results"]
+        }
+
+    print(f"\nCompared with {filename}:")
+    for result in results:
+        before = previous.get(result.key)
+        if before:
+            change = (result.median - before) / before * 100
+            print(f"{result.key:<64} {change:>+11.1f} %")
+
+
+def main(args: List[str]) -> None:
+    options = parse_args(args)
+    random.seed(options.seed)
+    timing = {"repeat": options.repeat, "min_time": options.min_time}
+
+    results: List[Result] = []
+    if "routing" in options.suites:
+        results += routing.run(options.sizes, options.seed, **timing)
+    if "patterns" in options.suites:
+        results += patterns.run(options.seed, **timing)
+    if "mocking" in options.suites:
+        results += mocking.run(options.sizes, options.seed, **timing)
+
+    output: Dict[str, Any] = {
+        "meta": {
+            "respx": respx.__version__,
+            "httpx": httpx.__version__,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "date": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "seed": options.seed,
+            "sizes": options.sizes,
+            **timing,
+        },
+        "results": [result.to_dict() for result in results],
+    }
+    with open(options.output, "w") as f:
+        json.dump(output, f, indent=2)
+    print(f"\nResults saved to {options.output}")
+
+    if options.compare:
+        compare(results, options.compare)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
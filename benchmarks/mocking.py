@@ -0,0 +1,68 @@
+import asyncio
+from functools import partial
+from typing import Any, List, Sequence
+
+import httpx
+
+from respx import MockRouter, Router
+
+from .routing import build_router
+from .utils import Result, Suite, async_runner, sync_runner
+
+MOCKERS = ("httpx", "httpcore")
+
+
+def run_mockers(suite: Suite) -> None:
+    """
+    Benchmarks sending a request through a mocked client, end-to-end.
+    """
+    loop = asyncio.new_event_loop()
+    url = "https://example.org/users/"
+
+    for using in MOCKERS:
+        with MockRouter(using=using, base_url="https://example.org") as respx_mock:
+            respx_mock.get("/users/", name="users").respond(json=[{"id": 1}])
+
+            with httpx.Client() as client:
+                suite.add(
+                    "send",
+                    sync_runner(partial(client.get, url)),
+                    mocker=using,
+                    mode="sync",
+                )
+
+            async_client = httpx.AsyncClient()
+            suite.add(
+                "send",
+                async_runner(partial(async_client.get, url), loop),
+                mocker=using,
+                mode="async",
+            )
+            loop.run_until_complete(async_client.aclose())
+
+    loop.close()
+
+
+def snapshot_rollback(router: Router) -> None:
+    router.snapshot()
+    router.rollback()
+
+
+def run_snapshots(sizes: Sequence[int], seed: int, suite: Suite) -> None:
+    """
+    Benchmarks a snapshot and rollback of routers with given number of routes.
+    """
+    for size in sizes:
+        router, __ = build_router(size, seed)
+        suite.add(
+            "snapshot_rollback",
+            sync_runner(partial(snapshot_rollback, router)),
+            routes=size,
+        )
+
+
+def run(sizes: Sequence[int], seed: int, **options: Any) -> List[Result]:
+    suite = Suite("mocking", **options)
+    run_mockers(suite)
+    run_snapshots(sizes, seed, suite)
+    return suite.results
@@ -0,0 +1,94 @@
+import json
+import random
+import re
+from typing import Any, Callable, Dict, List
+
+import httpx
+
+from respx.patterns import (
+    JSON,
+    URL,
+    Content,
+    Cookies,
+    Data,
+    Headers,
+    Host,
+    Lookup,
+    Method,
+    Params,
+    Path,
+    Pattern,
+    RequestView,
+    Scheme,
+)
+
+from .utils import Result, Suite, sync_runner
+
+
+def build_request(seed: int) -> httpx.Request:
+    """
+    Returns an authenticated JSON API request, with many params and headers.
+    """
+    rand = random.Random(seed)
+    params = tuple((f"param{i}", str(rand.randint(0, 999))) for i in range(50))
+    headers = {f"X-Header-{i}": str(rand.randint(0, 999)) for i in range(50)}
+    cookies = {f"cookie{i}": f"{rand.getrandbits(64):x}" for i in range(10)}
+    cookies["session"] = f"{rand.getrandbits(128):x}"
+    body = {
+        "user": {"id": 123, "name": "jonas", "roles": ["admin", "staff"]},
+        "items": [{"id": i, "value": rand.random()} for i in range(100)],
+    }
+    return httpx.Request(
+        "POST",
+        "https://api.example.org/v1/users/123/orders/",
+        params=params,
+        headers=headers,
+        cookies=cookies,
+        json=body,
+    )
+
+
+def build_patterns(request: httpx.Request) -> Dict[str, Pattern]:
+    body = json.loads(request.read())
+    params = httpx.QueryParams(request.url.query)
+    cookie = request.headers["cookie"].split("; ")[-1].split("=")
+    return {
+        "method": Method("POST"),
+        "scheme": Scheme("https"),
+        "host": Host("api.example.org"),
+        "path": Path("/v1/users/123/orders/"),
+        "path_regex": Path(
+            re.compile(r"^/v1/users/(?P<pk>\d+)/orders/$"), Lookup.REGEX
+        ),
+        "url_regex": URL(r"https://api\.example\.org/v1/users/\d+/", Lookup.REGEX),
+        "params": Params({"param10": params["param10"], "param40": params["param40"]}),
+        "params_eq": Params(params, Lookup.EQUAL),
+        "headers": Headers({"X-Header-25": request.headers["x-header-25"]}),
+        "cookies": Cookies({cookie[0]: cookie[1]}),
+        "content": Content(request.read()),
+        "json": JSON(body),
+        "json_path": JSON(body["user"]["roles"][1], path="user__roles__1"),
+        "data": Data({"foo": "bar"}),
+    }
+
+
+def compiled(pattern: Pattern, request: httpx.Request) -> Callable[[], Any]:
+    matcher = pattern.compile()
+    # New view per operation, to include parsing of the request
+    return lambda: matcher(RequestView(request))
+
+
+def interpreted(pattern: Pattern, request: httpx.Request) -> Callable[[], Any]:
+    return lambda: pattern.match(request)
+
+
+def run(seed: int, **options: Any) -> List[Result]:
+    suite = Suite("patterns", **options)
+    request = build_request(seed)
+    request.read()
+
+    for name, pattern in build_patterns(request).items():
+        suite.add(name, sync_runner(compiled(pattern, request)), mode="compiled")
+        suite.add(name, sync_runner(interpreted(pattern, request)), mode="interpreted")
+
+    return suite.results
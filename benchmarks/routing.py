@@ -0,0 +1,123 @@
+import asyncio
+import random
+from typing import Any, Callable, List, Sequence, Tuple, TypeVar
+
+import httpx
+
+from respx import Router
+from respx.patterns import M
+
+from .utils import Result, Suite, async_runner, sync_runner
+
+T = TypeVar("T")
+
+METHODS = ("GET", "POST", "PUT", "PATCH", "DELETE")
+RESOURCES = ("users", "groups", "orders", "items", "invoices", "events")
+
+
+def build_router(
+    size: int, seed: int, *, cache_size: int = 0
+) -> Tuple[Router, List[httpx.Request]]:
+    """
+    Returns router with given number of mixed routes, and requests matching
+    a random sample of them, followed by a request not matching any route.
+    """
+    rand = random.Random(seed)
+    hosts = [f"api{i}.example.org" for i in range(max(1, int(size**0.5)))]
+    router = Router(
+        assert_all_called=False, assert_all_mocked=False, cache_size=cache_size
+    )
+    response = httpx.Response(200)
+    targets: List[Tuple[str, str]] = []
+
+    for i in range(size):
+        method = rand.choice(METHODS)
+        host = rand.choice(hosts)
+        resource = rand.choice(RESOURCES)
+        kind = rand.random()
+        if kind < 0.1:
+            pattern = M(
+                method=method,
+                host=host,
+                path__regex=rf"^/{resource}/{i}/(?P<pk>\d+)/$",
+            )
+            url = f"https://{host}/{resource}/{i}/{rand.randint(1, 999)}/"
+        elif kind < 0.2:
+            pattern = M(
+                method=method,
+                host=host,
+                path=f"/{resource}/{i}/",
+                params={"page": str(i % 10)},
+            )
+            url = f"https://{host}/{resource}/{i}/?page={i % 10}"
+        else:
+            pattern = M(method=method, host=host, path=f"/{resource}/{i}/")
+            url = f"https://{host}/{resource}/{i}/"
+        router.route(pattern).mock(return_value=response)
+        targets.append((method, url))
+
+    requests = [
+        httpx.Request(method, url)
+        for method, url in rand.sample(targets, min(len(targets), 100))
+    ]
+    requests.append(httpx.Request("GET", "https://unknown.example.org/"))
+    return router, requests
+
+
+def cycle(
+    func: Callable[[httpx.Request], T], requests: Sequence[httpx.Request]
+) -> Callable[[], T]:
+    """
+    Returns function calling given func with the next of given requests.
+    """
+    position = 0
+    count = len(requests)
+
+    def call() -> T:
+        nonlocal position
+        position = (position + 1) % count
+        return func(requests[position])
+
+    return call
+
+
+def build_unindexed_router(size: int) -> Tuple[Router, List[httpx.Request]]:
+    """
+    Returns router with routes not indexable, i.e. worst case where every request
+    tries all routes, and a request not matching any of them.
+    """
+    router = Router(assert_all_called=False, assert_all_mocked=False)
+    for i in range(size):
+        router.route(params={"id": str(i)})
+    return router, [httpx.Request("GET", "https://example.org/?id=-1")]
+
+
+def run(sizes: Sequence[int], seed: int, **options: Any) -> List[Result]:
+    suite = Suite("routing", **options)
+    loop = asyncio.new_event_loop()
+
+    for size in sizes:
+        for cache_size in (0, 1024):
+            router, requests = build_router(size, seed, cache_size=cache_size)
+            suite.add(
+                "resolve",
+                sync_runner(cycle(router.resolve, requests)),
+                routes=size,
+                cache_size=cache_size,
+            )
+            suite.add(
+                "aresolve",
+                async_runner(cycle(router.aresolve, requests), loop),
+                routes=size,
+                cache_size=cache_size,
+            )
+
+        router, requests = build_unindexed_router(size)
+        suite.add(
+            "resolve_unindexed",
+            sync_runner(cycle(router.resolve, requests)),
+            routes=size,
+        )
+
+    loop.close()
+    return suite.results
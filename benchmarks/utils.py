@@ -0,0 +1,108 @@
+import asyncio
+import statistics
+import time
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+Runner = Callable[[int], float]
+
+
+class Result(NamedTuple):
+    suite: str
+    name: str
+    params: Dict[str, Any]
+    number: int
+    timings: List[float]  # Seconds per operation, one per repeat
+
+    @property
+    def key(self) -> str:
+        params = ",".join(f"{key}={value}" for key, value in self.params.items())
+        return f"{self.suite}:{self.name}[{params}]"
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.timings)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "suite": self.suite,
+            "name": self.name,
+            "params": self.params,
+            "number": self.number,
+            "min": min(self.timings),
+            "median": self.median,
+            "mean": statistics.mean(self.timings),
+            "timings": self.timings,
+        }
+
+
+def sync_runner(func: Callable[[], Any]) -> Runner:
+    """
+    Returns runner, timing given number of calls to func.
+    """
+
+    def run(number: int) -> float:
+        counter = time.perf_counter
+        start = counter()
+        for __ in range(number):
+            func()
+        return counter() - start
+
+    return run
+
+
+def async_runner(
+    func: Callable[[], Awaitable[Any]], loop: asyncio.AbstractEventLoop
+) -> Runner:
+    """
+    Returns runner, timing given number of awaited calls to func within one task.
+    """
+
+    async def timed(number: int) -> float:
+        counter = time.perf_counter
+        start = counter()
+        for __ in range(number):
+            await func()
+        return counter() - start
+
+    def run(number: int) -> float:
+        return loop.run_until_complete(timed(number))
+
+    return run
+
+
+def measure(
+    run: Runner,
+    *,
+    repeat: int = 5,
+    min_time: float = 0.05,
+    number: Optional[int] = None,
+) -> Tuple[List[float], int]:
+    """
+    Returns seconds per operation for each repeat, and operations per repeat,
+    calibrated to take at least `min_time` seconds, like `timeit`.
+    """
+    run(1)  # Warm up
+    if number is None:
+        number = 1
+        while run(number) < min_time:
+            number *= 2
+    return [run(number) / number for __ in range(repeat)], number
+
+
+class Suite:
+    """
+    Collects results of a named benchmark suite.
+    """
+
+    def __init__(self, name: str, *, repeat: int = 5, min_time: float = 0.05) -> None:
+        self.name = name
+        self.repeat = repeat
+        self.min_time = min_time
+        self.results: List[Result] = []
+
+    def add(self, name: str, run: Runner, **params: Any) -> Result:
+        timings, number = measure(run, repeat=self.repeat, min_time=self.min_time)
+        result = Result(self.name, name, params, number, timings)
+        self.results.append(result)
+        print(f"{result.key:<64} {result.median * 1e6:>12.2f} us/op", flush=True)
+        return result
@@ -4,7 +4,7 @@ nox.options.stop_on_first_error = True
 nox.options.reuse_existing_virtualenvs = True
 nox.options.keywords = "test + check"
 
-source_files = ("respx", "tests", "setup.py", "noxfile.py")
+source_files = ("respx", "tests", "benchmarks", "setup.py", "noxfile.py")
 lint_requirements = ("flake8", "black", "isort")
 docs_requirements = ("mkdocs", "mkdocs-material", "mkautodoc>=0.1.0")
 
@@ -44,6 +44,13 @@ def lint(session):
     check(session)
 
 
+@nox.session
+def benchmark(session):
+    session.install("-e", ".")
+
+    session.run("python", "-m", "benchmarks", *session.posargs)
+
+
 @nox.session
 def docs(session):
     session.install("--upgrade", *docs_requirements)
@@ -1,5 +1,5 @@
 from .__version__ import __version__
-from .handlers import ASGIHandler, WSGIHandler
+from .handlers import ASGIHandler, FileHandler, WSGIHandler
 from .models import MockResponse, Route
 from .router import MockRouter, Router
 
@@ -29,6 +29,7 @@ __all__ = [
     "MockResponse",
     "MockRouter",
     "ASGIHandler",
+    "FileHandler",
     "WSGIHandler",
     "Router",
     "Route",
@@ -0,0 +1,75 @@
+import gzip
+import zlib
+from itertools import chain
+from typing import Callable, Dict, Iterable, Optional
+
+try:
+    import brotlicffi
+except ImportError:  # pragma: nocover
+    brotlicffi = None
+
+COMPRESSORS: Dict[str, Callable[[bytes], bytes]] = {
+    "gzip": gzip.compress,
+    "deflate": zlib.compress,
+}
+if brotlicffi is not None:  # pragma: nocover
+    COMPRESSORS["br"] = brotlicffi.compress
+
+IDENTITY = "identity"
+
+
+def compress(content: bytes, encoding: str) -> bytes:
+    """
+    Compresses content with given content-coding, e.g. gzip, deflate or br.
+    """
+    try:
+        compressor = COMPRESSORS[encoding]
+    except KeyError:
+        hint = " Requires brotlicffi to be installed." if encoding == "br" else ""
+        raise ValueError(f"Unsupported content encoding {encoding!r}.{hint}")
+    return compressor(content)
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """
+    Parses an Accept-Encoding header into its lower-cased codings and q-values.
+    """
+    qvalues = {}
+    for item in header.split(","):
+        coding, *params = item.split(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        qvalue = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    qvalue = float(value)
+                except ValueError:
+                    qvalue = 0.0
+        qvalues[coding] = qvalue
+    return qvalues
+
+
+def negotiate(header: Optional[str], encodings: Iterable[str]) -> Optional[str]:
+    """
+    Returns the most preferred of given encodings, in server preference order,
+    acceptable by given Accept-Encoding header, falling back on identity,
+    or None if identity is excluded too, i.e. nothing is acceptable.
+    """
+    if header is None:
+        return IDENTITY
+
+    qvalues = parse_accept_encoding(header)
+    default = qvalues.get("*")
+    chosen: Optional[str] = None
+    best = 0.0
+    for encoding in chain(encodings, (IDENTITY,)):
+        qvalue = qvalues.get(encoding, default)
+        if qvalue is None:
+            # Identity is acceptable unless explicitly excluded
+            qvalue = 1.0 if encoding == IDENTITY else 0.0
+        if qvalue > best:
+            chosen, best = encoding, qvalue
+    return chosen
@@ -1,7 +1,13 @@
-from typing import Any, Callable
+import mimetypes
+import mmap
+import os
+from email.utils import formatdate
+from typing import Any, AsyncIterator, Callable, Iterator, Optional, Union
 
 import httpx
 
+from .types import HeaderTypes
+
 
 class TransportHandler:
     def __init__(self, transport: httpx.BaseTransport) -> None:
@@ -64,3 +70,148 @@ class WSGIHandler(TransportHandler):
 class ASGIHandler(AsyncTransportHandler):
     def __init__(self, app: Callable, **kwargs: Any) -> None:
         super().__init__(httpx.ASGITransport(app=app, **kwargs))
+
+
+class FileStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    def __init__(
+        self, data: Union[bytes, mmap.mmap], start: int, end: int, chunk_size: int
+    ) -> None:
+        self.data = data
+        self.start = start
+        self.end = end
+        self.chunk_size = chunk_size
+
+    def __iter__(self) -> Iterator[bytes]:
+        for offset in range(self.start, self.end, self.chunk_size):
+            yield self.data[offset : min(offset + self.chunk_size, self.end)]
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for chunk in self:
+            yield chunk
+
+
+class FileHandler:
+    """
+    Serves a file as response body, memory-mapped and streamed in chunks,
+    with support for single byte range requests, i.e. `Range` and `If-Range`.
+    """
+
+    chunk_size = 64 * 1024
+    # Side effect traits, i.e. always responds, and only by request headers
+    declines = False
+    reads_content = False
+
+    def __init__(
+        self,
+        path: Union[str, "os.PathLike[str]"],
+        status_code: int = 200,
+        *,
+        headers: Optional[HeaderTypes] = None,
+        content_type: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+    ) -> None:
+        self.path = os.fspath(path)
+        self.status_code = status_code
+        self.headers = httpx.Headers(headers)
+        self.content_type = (
+            content_type
+            or mimetypes.guess_type(self.path)[0]
+            or "application/octet-stream"
+        )
+        self.chunk_size = chunk_size or self.chunk_size
+
+        stat = os.stat(self.path)
+        self.size = stat.st_size
+        self.etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        self.last_modified = formatdate(stat.st_mtime, usegmt=True)
+        self._data: Optional[Union[bytes, mmap.mmap]] = None
+
+    @property
+    def data(self) -> Union[bytes, mmap.mmap]:
+        """
+        Lazily memory-mapped file content.
+        """
+        if self._data is None:
+            if not self.size:
+                self._data = b""  # Empty files can't be mapped
+            else:
+                with open(self.path, "rb") as f:
+                    self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._data
+
+    def close(self) -> None:
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._data = None
+
+    def byte_range(self, request: httpx.Request) -> Optional[slice]:
+        """
+        Returns requested byte range, or None to serve the whole file.
+
+        Unsatisfiable ranges are returned with their start beyond the file size.
+        """
+        header = request.headers.get("Range")
+        if not header or self.status_code != 200:
+            return None
+
+        # Ignore range if the file has changed since a prior response
+        if_range = request.headers.get("If-Range")
+        if if_range and if_range not in (self.etag, self.last_modified):
+            return None
+
+        # Only a single byte range is supported, else ignored
+        unit, _, spec = header.partition("=")
+        first, dash, last = spec.strip().partition("-")
+        if (
+            unit.strip().lower() != "bytes"
+            or not dash
+            or not (first or last)
+            or (first and not first.isdigit())
+            or (last and not last.isdigit())
+        ):
+            return None
+
+        if not first:
+            # Suffix range, i.e. last N bytes, where zero bytes is unsatisfiable
+            suffix = int(last)
+            start = max(self.size - suffix, 0) if suffix else self.size
+            return slice(start, self.size)
+
+        start = int(first)
+        if start >= self.size:
+            return slice(start, self.size)
+
+        end = int(last) + 1 if last else self.size
+        if end <= start:
+            return None  # Invalid range
+
+        return slice(start, min(end, self.size))
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        headers = httpx.Headers(self.headers)
+        headers.setdefault("Content-Type", self.content_type)
+        headers["Accept-Ranges"] = "bytes"
+        headers["ETag"] = self.etag
+        headers["Last-Modified"] = self.last_modified
+
+        status_code = self.status_code
+        start, end = 0, self.size
+        byte_range = self.byte_range(request)
+        if byte_range is not None:
+            if byte_range.start >= self.size:
+                status_code = 416
+                start = end = 0
+                headers["Content-Range"] = f"bytes */{self.size}"
+            else:
+                status_code = 206
+                start, end = byte_range.start, byte_range.stop
+                headers["Content-Range"] = f"bytes {start}-{end - 1}/{self.size}"
+
+        headers["Content-Length"] = str(end - start)
+        if request.method == "HEAD":
+            start = end = 0
+
+        stream = FileStream(self.data, start, end, self.chunk_size)
+        return httpx.Response(
+            status_code, headers=headers, stream=stream, request=request
+        )
@@ -0,0 +1,386 @@
+import re
+import sys
+from abc import ABC
+from os.path import commonprefix
+from typing import (
+    AbstractSet,
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Optional,
+    Pattern as RegexPattern,
+    Set,
+    Tuple,
+)
+
+if sys.version_info >= (3, 11):  # pragma: nocover
+    from re import _constants as sre_constants, _parser as sre_parse  # type: ignore
+else:  # pragma: nocover
+    import sre_constants
+    import sre_parse
+
+from .patterns import (
+    URL,
+    Host,
+    Lookup,
+    Method,
+    Path,
+    Pattern,
+    Port,
+    RequestView,
+    Scheme,
+    _And,
+)
+
+EMPTY: FrozenSet[int] = frozenset()
+
+# Start of string assertions, anchoring a regex literal prefix
+ANCHORS = (
+    (sre_constants.AT, sre_constants.AT_BEGINNING),
+    (sre_constants.AT, sre_constants.AT_BEGINNING_STRING),
+)
+
+# Regex syntax that can't be combined with other regexes, i.e. back references
+UNCOMBINABLE_REGEX = re.compile(r"\(\?P=|\(\?\(|\\[1-9]")
+NAMED_GROUP_REGEX = re.compile(r"\(\?P<\w+>")
+REGEX_FLAGS = (
+    (re.ASCII, "a"),
+    (re.IGNORECASE, "i"),
+    (re.MULTILINE, "m"),
+    (re.DOTALL, "s"),
+    (re.VERBOSE, "x"),
+)
+
+
+def iter_required(pattern: Optional[Pattern]) -> Iterator[Pattern]:
+    """
+    Yields the patterns that all must match for given pattern to match,
+    i.e. the operands of the top level AND chain.
+    """
+    if pattern is None:
+        return
+    if isinstance(pattern, _And):
+        for operand in pattern.value:
+            yield from iter_required(operand)
+    else:
+        yield pattern
+
+
+class Dimension(ABC):
+    """
+    Index of route positions, by one request facet.
+
+    Routes without an indexable pattern for the facet are kept as `wild`,
+    i.e. candidates for any request.
+    """
+
+    def __init__(self) -> None:
+        self.wild: Set[int] = set()
+        self.parse: Optional[Callable[[RequestView], Any]] = None
+
+    def __bool__(self) -> bool:
+        return self.parse is not None
+
+    def add(self, position: int, patterns: List[Pattern]) -> None:
+        for pattern in patterns:
+            if self.index(position, pattern):
+                self.parse = pattern.parse
+                return
+        self.wild.add(position)
+
+    def index(self, position: int, pattern: Pattern) -> bool:  # pragma: nocover
+        """
+        Index route position by given pattern, if supported.
+        """
+        raise NotImplementedError()
+
+    def lookup(self, request: RequestView) -> AbstractSet[int]:  # pragma: nocover
+        """
+        Returns positions of indexed routes that may match given request.
+        """
+        raise NotImplementedError()
+
+
+class ValueDimension(Dimension):
+    """
+    Buckets route positions by the values of a pattern's EQUAL or IN lookup.
+    """
+
+    def __init__(self, key: str) -> None:
+        super().__init__()
+        self.key = key
+        self.buckets: Dict[Any, Set[int]] = {}
+
+    def index(self, position: int, pattern: Pattern) -> bool:
+        if getattr(pattern, "key", None) != self.key or pattern.base:
+            return False
+
+        if pattern.lookup is Lookup.EQUAL:
+            values = (pattern.value,)
+        elif pattern.lookup is Lookup.IN and not isinstance(pattern.value, str):
+            values = pattern.value
+        else:
+            return False
+
+        for value in values:
+            self.buckets.setdefault(value, set()).add(position)
+
+        return True
+
+    def lookup(self, request: RequestView) -> AbstractSet[int]:
+        value = self.parse(request)
+        return self.buckets.get(value, EMPTY)
+
+
+class RadixTree:
+    """
+    Radix tree of route positions, by exact and prefix keys.
+    """
+
+    def __init__(self, label: str = "") -> None:
+        self.label = label
+        self.edges: Dict[str, "RadixTree"] = {}
+        self.exact: Set[int] = set()
+        self.prefix: Set[int] = set()
+
+    def insert(self, key: str) -> "RadixTree":
+        """
+        Returns node for given key, splitting edges as needed.
+        """
+        node = self
+        while key:
+            child = node.edges.get(key[0])
+            if child is None:
+                child = RadixTree(key)
+                node.edges[key[0]] = child
+                return child
+
+            common = len(commonprefix((child.label, key)))
+            if common < len(child.label):
+                # Split edge at common prefix
+                split = RadixTree(child.label[:common])
+                child.label = child.label[common:]
+                split.edges[child.label[0]] = child
+                node.edges[key[0]] = split
+                child = split
+
+            node = child
+            key = key[common:]
+
+        return node
+
+    def lookup(self, key: str) -> Set[int]:
+        """
+        Returns positions with a prefix of, or equal to, given key in one walk.
+        """
+        found: Set[int] = set()
+        node = self
+        while True:
+            found |= node.prefix
+            if not key:
+                found |= node.exact
+                break
+
+            child = node.edges.get(key[0])
+            if child is None or not key.startswith(child.label):
+                break
+
+            key = key[len(child.label) :]
+            node = child
+
+        return found
+
+
+class PathDimension(Dimension):
+    """
+    Radix trees of route positions by `Path` EQUAL, STARTS_WITH and IN lookups,
+    with a separate tree of stripped paths per base path.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.tree = RadixTree()
+        self.based: Dict[str, Tuple[Pattern, RadixTree]] = {}
+
+    def index(self, position: int, pattern: Pattern) -> bool:
+        if getattr(pattern, "key", None) != Path.key:
+            return False
+
+        if pattern.lookup in (Lookup.EQUAL, Lookup.STARTS_WITH):
+            values = (pattern.value,)
+        elif pattern.lookup is Lookup.IN and not isinstance(pattern.value, str):
+            values = pattern.value
+        else:
+            return False
+
+        if not all(isinstance(value, str) for value in values):
+            return False
+
+        base = pattern.base
+        tree = self.tree
+        if base:
+            __, tree = self.based.setdefault(base.value, (pattern, RadixTree()))
+
+        for value in values:
+            node = tree.insert(value)
+            if pattern.lookup is Lookup.STARTS_WITH:
+                node.prefix.add(position)
+            else:
+                node.exact.add(position)
+
+        return True
+
+    def lookup(self, request: RequestView) -> AbstractSet[int]:
+        path = self.parse(request)
+        found = self.tree.lookup(path)
+        for base, (pattern, tree) in self.based.items():
+            if path.startswith(base):
+                found |= tree.lookup(pattern.strip_base(path))
+        return found
+
+
+def get_literal_prefix(regex: RegexPattern[str]) -> str:
+    """
+    Returns the literal string that any match of an anchored regex starts with,
+    or an empty string if unknown, e.g. for a top level alternation.
+    """
+    if regex.flags & (re.IGNORECASE | re.MULTILINE):
+        return ""
+
+    items = list(sre_parse.parse(regex.pattern, regex.flags))
+    if not items or items[0] not in ANCHORS:
+        return ""
+
+    prefix = []
+    for op, value in items[1:]:
+        if op is not sre_constants.LITERAL:
+            break
+        prefix.append(chr(value))
+
+    return "".join(prefix)
+
+
+class RegexDimension(Dimension):
+    """
+    Combines the REGEX lookups of routes into a single automaton, one optional
+    lookahead per route tagged with a named group, so that one regex match
+    finds all routes that may match.
+
+    Routes are prefiltered by their literal prefixes, and automatons compiled
+    per set of prefiltered routes.
+    """
+
+    max_automatons = 128
+
+    def __init__(self, key: str) -> None:
+        super().__init__()
+        self.key = key
+        self.lookaheads: Dict[int, str] = {}
+        self.prefixes = RadixTree()
+        self.automatons: Dict[Tuple[int, ...], RegexPattern[str]] = {}
+
+    def index(self, position: int, pattern: Pattern) -> bool:
+        if (
+            getattr(pattern, "key", None) != self.key
+            or pattern.lookup is not Lookup.REGEX
+            or pattern.base
+            or not isinstance(pattern.value.pattern, str)
+            or UNCOMBINABLE_REGEX.search(pattern.value.pattern)
+        ):
+            return False
+
+        # Strip named groups, to not clash with other routes or tags
+        source = NAMED_GROUP_REGEX.sub("(", pattern.value.pattern)
+        flags = "".join(flag for bit, flag in REGEX_FLAGS if pattern.value.flags & bit)
+        if flags:
+            source = f"(?{flags}:{source})"
+
+        tag = f"_{position}"
+        lookahead = f"(?:(?=[\\s\\S]*?(?:{source})(?P<{tag}>))|)"
+        try:
+            re.compile(lookahead)
+        except re.error:
+            return False
+
+        self.lookaheads[position] = lookahead
+        self.prefixes.insert(get_literal_prefix(pattern.value)).prefix.add(position)
+        self.automatons.clear()
+
+        return True
+
+    def lookup(self, request: RequestView) -> AbstractSet[int]:
+        value = self.parse(request)
+        positions = tuple(sorted(self.prefixes.lookup(value)))
+        if not positions:
+            return EMPTY
+
+        automaton = self.automatons.get(positions)
+        if automaton is None:
+            if len(self.automatons) >= self.max_automatons:
+                self.automatons.clear()
+            automaton = re.compile(
+                "".join(self.lookaheads[position] for position in positions)
+            )
+            self.automatons[positions] = automaton
+
+        match = automaton.match(value)
+        return {
+            int(tag[1:])
+            for tag, found in match.groupdict().items()
+            if found is not None
+        }
+
+
+class RouteIndex:
+    """
+    Dispatch index of route positions, used to narrow down the routes
+    to match a request against, while keeping their order.
+    """
+
+    def __init__(self) -> None:
+        self.dimensions: List[Dimension] = [
+            ValueDimension(Method.key),
+            ValueDimension(Scheme.key),
+            ValueDimension(Host.key),
+            ValueDimension(Port.key),
+            PathDimension(),
+            RegexDimension(Host.key),
+            RegexDimension(Path.key),
+            RegexDimension(URL.key),
+        ]
+        self.positions: Dict[Optional[Pattern], int] = {}
+        self.size = 0
+
+    def add(self, pattern: Optional[Pattern]) -> None:
+        """
+        Indexes next route position by given route pattern.
+        """
+        self.positions.setdefault(pattern, self.size)
+        patterns = list(iter_required(pattern))
+        for dimension in self.dimensions:
+            dimension.add(self.size, patterns)
+        self.size += 1
+
+    def lookup(self, request: RequestView) -> List[int]:
+        """
+        Returns sorted positions of the routes that may match given request.
+        """
+        hits = [
+            (dimension.lookup(request), dimension.wild)
+            for dimension in self.dimensions
+            if dimension
+        ]
+        if not hits:
+            return list(range(self.size))
+
+        # Start with the most selective dimension, and filter by the others
+        hits.sort(key=lambda hit: len(hit[0]) + len(hit[1]))
+        found, wild = hits[0]
+        positions = found | wild
+        for found, wild in hits[1:]:
+            positions = {p for p in positions if p in found or p in wild}
+
+        return sorted(positions)
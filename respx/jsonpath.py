@@ -0,0 +1,123 @@
+import json as jsonlib
+import re
+from typing import Any, Sequence, Union
+
+WHITESPACE = re.compile(rb"[ \t\n\r]*")
+STRING = re.compile(rb'"(?:[^"\\]|\\.)*"', re.DOTALL)
+SCALAR = re.compile(rb"[^,:\]}\s]+")
+TOKENS = re.compile(rb'"(?:[^"\\]|\\.)*"|[\[\]{}]', re.DOTALL)
+
+# Returned when the document doesn't have the container type a path step expects
+UNSUPPORTED = object()
+
+
+class Scanner:
+    """
+    Incremental scanner of raw JSON bytes, walking a path of object keys and
+    array indexes without decoding anything but the keys on the way and the
+    value found.
+
+    Stops as soon as the path is found or ruled out, i.e. any remainder of the
+    document is neither decoded nor validated, and the first of any duplicate
+    keys is selected.
+    """
+
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+        self.pos = 0
+
+    def skip_whitespace(self) -> int:
+        self.pos = WHITESPACE.match(self.data, self.pos).end()
+        return self.pos
+
+    def peek(self) -> bytes:
+        return self.data[self.skip_whitespace() : self.pos + 1]
+
+    def expect(self, token: bytes) -> None:
+        if self.peek() != token:
+            raise ValueError(f"Expected {token!r} at position {self.pos}")
+        self.pos += 1
+
+    def skip_value(self) -> int:
+        """
+        Skips the value at current position, returning its start position.
+        """
+        start = self.skip_whitespace()
+        char = self.data[start : start + 1]
+        if char == b'"':
+            match = STRING.match(self.data, start)
+        elif char in (b"{", b"["):
+            match = None
+            depth = 0
+            for token in TOKENS.finditer(self.data, start):
+                if token.group() in (b"{", b"["):
+                    depth += 1
+                elif token.group() in (b"}", b"]"):
+                    depth -= 1
+                    if not depth:
+                        match = token
+                        break
+        else:
+            match = SCALAR.match(self.data, start)
+
+        if match is None:
+            raise ValueError(f"Invalid value at position {start}")
+
+        self.pos = match.end()
+        return start
+
+    def find_key(self, key: str) -> bool:
+        self.expect(b"{")
+        if self.peek() == b"}":
+            return False
+        while True:
+            self.skip_whitespace()
+            match = STRING.match(self.data, self.pos)
+            if match is None:
+                raise ValueError(f"Expected key at position {self.pos}")
+            self.pos = match.end()
+            self.expect(b":")
+            if jsonlib.loads(match.group()) == key:
+                return True
+            self.skip_value()
+            if self.peek() == b"}":
+                return False
+            self.expect(b",")
+
+    def find_index(self, index: int) -> bool:
+        self.expect(b"[")
+        if self.peek() == b"]":
+            return False
+        for __ in range(index):
+            self.skip_value()
+            if self.peek() == b"]":
+                return False
+            self.expect(b",")
+        return True
+
+    def extract(self, path: Sequence[Union[str, int]]) -> Any:
+        """
+        Returns the decoded value at given path, `UNSUPPORTED` when a step
+        doesn't fit the document's container type, and raises KeyError or
+        IndexError when the path is not in the document.
+        """
+        for key in path:
+            char = self.peek()
+            if isinstance(key, str) and char == b"{":
+                if not self.find_key(key):
+                    raise KeyError(key)
+            elif isinstance(key, int) and char == b"[":
+                if not self.find_index(key):
+                    raise IndexError(key)
+            else:
+                return UNSUPPORTED
+
+        start = self.skip_value()
+        return jsonlib.loads(self.data[start : self.pos])
+
+
+def extract(data: bytes, path: Sequence[Union[str, int]]) -> Any:
+    """
+    Returns the decoded value at given path of raw JSON bytes, by scanning.
+    """
+    return Scanner(data).extract(path)
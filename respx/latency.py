@@ -0,0 +1,250 @@
+import asyncio
+import math
+import random
+import time
+from bisect import bisect_right
+from typing import AsyncIterator, Iterator, Mapping, Optional, Union, cast
+
+import httpx
+
+
+class Latency:
+    """
+    Latency model, sampling simulated response delays in seconds,
+    using its own random generator seeded by given seed.
+    """
+
+    def __init__(self, *, seed: Optional[int] = None) -> None:
+        self.random = random.Random(seed)
+
+    def __repr__(self) -> str:  # pragma: nocover
+        return f"<{self.__class__.__name__}>"
+
+    @classmethod
+    def of(cls, latency: Optional[Union["Latency", float]]) -> Optional["Latency"]:
+        """
+        Returns given latency model, or a fixed latency for given seconds.
+        """
+        if latency is None or isinstance(latency, Latency):
+            return latency
+        if isinstance(latency, (int, float)):
+            return Fixed(latency)
+        raise TypeError(f"Latency must be a Latency model or seconds, got {latency!r}")
+
+    def sample(self) -> float:
+        """
+        Returns a sampled, non-negative, latency in seconds.
+        """
+        return max(self._sample(), 0.0)
+
+    def _sample(self) -> float:
+        raise NotImplementedError()  # pragma: nocover
+
+
+class Fixed(Latency):
+    def __init__(self, seconds: float) -> None:
+        super().__init__()
+        self.seconds = seconds
+
+    def _sample(self) -> float:
+        return self.seconds
+
+
+class Uniform(Latency):
+    def __init__(self, low: float, high: float, *, seed: Optional[int] = None) -> None:
+        super().__init__(seed=seed)
+        self.low = low
+        self.high = high
+
+    def _sample(self) -> float:
+        return self.random.uniform(self.low, self.high)
+
+
+class Normal(Latency):
+    def __init__(
+        self, mean: float, stddev: float, *, seed: Optional[int] = None
+    ) -> None:
+        super().__init__(seed=seed)
+        self.mean = mean
+        self.stddev = stddev
+
+    def _sample(self) -> float:
+        return self.random.gauss(self.mean, self.stddev)
+
+
+class LogNormal(Latency):
+    """
+    Log-normal latency, i.e. long tailed, with given median and shape sigma.
+    """
+
+    def __init__(
+        self, median: float, sigma: float, *, seed: Optional[int] = None
+    ) -> None:
+        super().__init__(seed=seed)
+        self.median = median
+        self.sigma = sigma
+
+    def _sample(self) -> float:
+        return self.random.lognormvariate(math.log(self.median), self.sigma)
+
+
+class Empirical(Latency):
+    """
+    Latency interpolated from observed percentiles, e.g. `{50: 0.1, 99: 0.8}`.
+    """
+
+    def __init__(
+        self, percentiles: Mapping[float, float], *, seed: Optional[int] = None
+    ) -> None:
+        super().__init__(seed=seed)
+        if not percentiles:
+            raise ValueError("Empirical latency requires at least one percentile")
+        points = sorted(percentiles.items())
+        if points[0][0] < 0 or points[-1][0] > 100:
+            raise ValueError("Empirical latency percentiles must be within 0-100")
+        self.percentiles = [percentile for percentile, _ in points]
+        self.seconds = [seconds for _, seconds in points]
+
+    def _sample(self) -> float:
+        percentile = self.random.uniform(0, 100)
+        i = bisect_right(self.percentiles, percentile)
+        if i == 0:
+            return self.seconds[0]
+        if i == len(self.percentiles):
+            return self.seconds[-1]
+
+        low, high = self.percentiles[i - 1], self.percentiles[i]
+        fraction = (percentile - low) / (high - low)
+        return self.seconds[i - 1] + fraction * (self.seconds[i] - self.seconds[i - 1])
+
+
+def sleep(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+async def asleep(seconds: float) -> None:
+    """
+    Non-blocking sleep, within the running async library.
+    """
+    try:
+        import sniffio
+    except ImportError:  # pragma: nocover
+        library = "asyncio"  # Not installed, i.e. no trio support either
+    else:
+        library = sniffio.current_async_library()
+
+    if library == "trio":  # pragma: nocover
+        import trio
+
+        await trio.sleep(seconds)
+    else:
+        await asyncio.sleep(seconds)
+
+
+class Bandwidth:
+    """
+    Throughput limit of mocked response streams, in bytes per second,
+    with an optional burst of bytes to send before being throttled.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None) -> None:
+        if rate <= 0:
+            raise ValueError(f"Bandwidth rate must be positive, got {rate!r}")
+        self.rate = rate
+        self.burst = burst or 0
+        # Max bytes to send at once, to pace large chunks
+        self.chunk_size = self.burst or max(int(rate) // 10, 1)
+
+    def __repr__(self) -> str:  # pragma: nocover
+        return f"<Bandwidth rate={self.rate!r} burst={self.burst!r}>"
+
+    @classmethod
+    def of(
+        cls, bandwidth: Optional[Union["Bandwidth", float]]
+    ) -> Optional["Bandwidth"]:
+        """
+        Returns given bandwidth, or a bandwidth for given bytes per second.
+        """
+        if bandwidth is None or isinstance(bandwidth, Bandwidth):
+            return bandwidth
+        if isinstance(bandwidth, (int, float)):
+            return Bandwidth(bandwidth)
+        raise TypeError(
+            f"Bandwidth must be a Bandwidth or bytes per second, got {bandwidth!r}"
+        )
+
+    def throttle(
+        self, stream: Union[httpx.SyncByteStream, httpx.AsyncByteStream]
+    ) -> "ThrottledStream":
+        return ThrottledStream(stream, self)
+
+
+class TokenBucket:
+    """
+    Token bucket of bytes, refilled at given rate up to given capacity,
+    where taking more than available is paid back by waiting.
+    """
+
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def take(self, size: int) -> float:
+        """
+        Takes given number of bytes, returning seconds to wait before sending.
+        """
+        now = time.monotonic()
+        elapsed = now - self.updated
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate) - size
+        self.updated = now
+        return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+
+class ThrottledStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    """
+    Paces a response stream to a bandwidth, with cooperative sleeps when async.
+    """
+
+    def __init__(
+        self,
+        stream: Union[httpx.SyncByteStream, httpx.AsyncByteStream],
+        bandwidth: Bandwidth,
+    ) -> None:
+        self.stream = stream
+        self.bandwidth = bandwidth
+
+    def split(self, chunk: bytes) -> Iterator[bytes]:
+        size = self.bandwidth.chunk_size
+        if len(chunk) <= size:
+            yield chunk
+        else:
+            for offset in range(0, len(chunk), size):
+                yield chunk[offset : offset + size]
+
+    def __iter__(self) -> Iterator[bytes]:
+        bucket = TokenBucket(self.bandwidth.rate, self.bandwidth.burst)
+        for chunk in cast(httpx.SyncByteStream, self.stream):
+            for piece in self.split(chunk):
+                delay = bucket.take(len(piece))
+                if delay:
+                    sleep(delay)
+                yield piece
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        bucket = TokenBucket(self.bandwidth.rate, self.bandwidth.burst)
+        async for chunk in cast(httpx.AsyncByteStream, self.stream):
+            for piece in self.split(chunk):
+                delay = bucket.take(len(piece))
+                if delay:
+                    await asleep(delay)
+                yield piece
+
+    def close(self) -> None:
+        cast(httpx.SyncByteStream, self.stream).close()
+
+    async def aclose(self) -> None:
+        await cast(httpx.AsyncByteStream, self.stream).aclose()
@@ -7,7 +7,7 @@ from unittest import mock
 import httpx
 from httpcore import AsyncIteratorByteStream, IteratorByteStream
 
-from .models import PassThrough
+from .models import PassThrough, TemplateResponse
 from .transports import TryTransport
 
 if TYPE_CHECKING:
@@ -103,12 +103,21 @@ class Mocker(ABC):
             cls.start()
 
     @classmethod
-    def handler(cls, httpx_request):
+    def lookup(cls, httpx_request):
+        """
+        Looks up candidate routes of each registered router, once per request,
+        i.e. when resolved later, for routers that may leave the body unread.
+        """
+        return {router: router.lookup(httpx_request) for router in cls.routers}
+
+    @classmethod
+    def handler(cls, httpx_request, candidates=None):
         httpx_response = None
         error = None
         for router in cls.routers:
+            routes = candidates.get(router) if candidates else None
             try:
-                httpx_response = router.handler(httpx_request)
+                httpx_response = router.handler(httpx_request, routes)
             except AssertionError as e:
                 error = e.args[0]
                 continue
@@ -119,12 +128,13 @@ class Mocker(ABC):
         return httpx_response
 
     @classmethod
-    async def async_handler(cls, httpx_request):
+    async def async_handler(cls, httpx_request, candidates=None):
         httpx_response = None
         error = None
         for router in cls.routers:
+            routes = candidates.get(router) if candidates else None
             try:
-                httpx_response = await router.async_handler(httpx_request)
+                httpx_response = await router.async_handler(httpx_request, routes)
             except AssertionError as e:
                 error = e.args[0]
                 continue
@@ -171,18 +181,32 @@ class AbstractRequestMocker(Mocker):
         def mock(self, *args, **kwargs):
             kwargs = cls._merge_args_and_kwargs(argspec, args, kwargs)
             request = cls.to_httpx_request(**kwargs)
-            request, kwargs = cls.prepare_sync_request(request, **kwargs)
+            candidates = cls.lookup(request)
+            request, kwargs = cls.prepare_sync_request(
+                request, candidates=candidates, **kwargs
+            )
             response = cls._send_sync_request(
-                request, target_spec=spec, instance=self, **kwargs
+                request,
+                candidates=candidates,
+                target_spec=spec,
+                instance=self,
+                **kwargs,
             )
             return response
 
         async def amock(self, *args, **kwargs):
             kwargs = cls._merge_args_and_kwargs(argspec, args, kwargs)
             request = cls.to_httpx_request(**kwargs)
-            request, kwargs = await cls.prepare_async_request(request, **kwargs)
+            candidates = cls.lookup(request)
+            request, kwargs = await cls.prepare_async_request(
+                request, candidates=candidates, **kwargs
+            )
             response = await cls._send_async_request(
-                request, target_spec=spec, instance=self, **kwargs
+                request,
+                candidates=candidates,
+                target_spec=spec,
+                instance=self,
+                **kwargs,
             )
             return response
 
@@ -201,9 +225,11 @@ class AbstractRequestMocker(Mocker):
         return new_kwargs
 
     @classmethod
-    def _send_sync_request(cls, httpx_request, *, target_spec, instance, **kwargs):
+    def _send_sync_request(
+        cls, httpx_request, *, candidates=None, target_spec, instance, **kwargs
+    ):
         try:
-            httpx_response = cls.handler(httpx_request)
+            httpx_response = cls.handler(httpx_request, candidates)
         except PassThrough:
             response = target_spec(instance, **kwargs)
         else:
@@ -212,10 +238,10 @@ class AbstractRequestMocker(Mocker):
 
     @classmethod
     async def _send_async_request(
-        cls, httpx_request, *, target_spec, instance, **kwargs
+        cls, httpx_request, *, candidates=None, target_spec, instance, **kwargs
     ):
         try:
-            httpx_response = await cls.async_handler(httpx_request)
+            httpx_response = await cls.async_handler(httpx_request, candidates)
         except PassThrough:
             response = await target_spec(instance, **kwargs)
         else:
@@ -225,19 +251,36 @@ class AbstractRequestMocker(Mocker):
         return response
 
     @classmethod
-    def prepare_sync_request(cls, httpx_request, **kwargs):
+    def reads_content(cls, httpx_request, candidates=None):
         """
-        Sync pre-read request body
+        Returns True if the request body should be pre-read, i.e. when already
+        in memory, or unless all registered routers opt out of reading it.
         """
-        httpx_request.read()
+        if isinstance(httpx_request.stream, httpx.ByteStream):
+            return True
+        return any(
+            router.reads_content(
+                httpx_request, candidates.get(router) if candidates else None
+            )
+            for router in cls.routers
+        )
+
+    @classmethod
+    def prepare_sync_request(cls, httpx_request, *, candidates=None, **kwargs):
+        """
+        Sync pre-read request body, unless opted out, leaving the stream unread.
+        """
+        if cls.reads_content(httpx_request, candidates):
+            httpx_request.read()
         return httpx_request, kwargs
 
     @classmethod
-    async def prepare_async_request(cls, httpx_request, **kwargs):
+    async def prepare_async_request(cls, httpx_request, *, candidates=None, **kwargs):
         """
-        Async pre-read request body
+        Async pre-read request body, unless opted out, leaving the stream unread.
         """
-        await httpx_request.aread()
+        if cls.reads_content(httpx_request, candidates):
+            await httpx_request.aread()
         return httpx_request, kwargs
 
     @classmethod
@@ -266,21 +309,23 @@ class HTTPCoreMocker(AbstractRequestMocker):
     target_methods = ["handle_request", "handle_async_request"]
 
     @classmethod
-    def prepare_sync_request(cls, httpx_request, **kwargs):
+    def prepare_sync_request(cls, httpx_request, *, candidates=None, **kwargs):
         """
         Sync pre-read request body, and update transport request args.
         """
-        httpx_request, kwargs = super().prepare_sync_request(httpx_request, **kwargs)
+        httpx_request, kwargs = super().prepare_sync_request(
+            httpx_request, candidates=candidates, **kwargs
+        )
         kwargs["stream"] = httpx_request.stream
         return httpx_request, kwargs
 
     @classmethod
-    async def prepare_async_request(cls, httpx_request, **kwargs):
+    async def prepare_async_request(cls, httpx_request, *, candidates=None, **kwargs):
         """
         Async pre-read request body, and update transport request args.
         """
         httpx_request, kwargs = await super().prepare_async_request(
-            httpx_request, **kwargs
+            httpx_request, candidates=candidates, **kwargs
         )
         kwargs["stream"] = httpx_request.stream
         return httpx_request, kwargs
@@ -297,6 +342,15 @@ class HTTPCoreMocker(AbstractRequestMocker):
             stream=kwargs.get("stream"),
         )
 
+    @classmethod
+    def raw_headers(cls, httpx_response):
+        """
+        Returns raw response headers, pre-encoded if cloned from a template.
+        """
+        if isinstance(httpx_response, TemplateResponse):
+            return httpx_response.template.raw_headers
+        return httpx_response.headers.raw
+
     @classmethod
     def from_sync_httpx_response(cls, httpx_response, target, **kwargs):
         """
@@ -304,7 +358,7 @@ class HTTPCoreMocker(AbstractRequestMocker):
         """
         return (
             httpx_response.status_code,
-            httpx_response.headers.raw,
+            cls.raw_headers(httpx_response),
             IteratorByteStream(httpx_response.stream.__iter__()),
             httpx_response.extensions,
         )
@@ -316,7 +370,7 @@ class HTTPCoreMocker(AbstractRequestMocker):
         """
         return (
             httpx_response.status_code,
-            httpx_response.headers.raw,
+            cls.raw_headers(httpx_response),
             AsyncIteratorByteStream(httpx_response.stream.__aiter__()),
             httpx_response.extensions,
         )
@@ -1,13 +1,21 @@
 import inspect
+import os
+import random
+import time
+from collections import Counter
 from typing import (
     Any,
+    AsyncIterator,
     Callable,
+    Counter as CounterType,
     Dict,
     Iterable,
     Iterator,
     List,
+    Mapping,
     NamedTuple,
     Optional,
+    Sequence,
     Tuple,
     Type,
     Union,
@@ -15,10 +23,15 @@ from typing import (
 )
 from unittest import mock
 from warnings import warn
+from weakref import WeakSet
 
 import httpx
 
-from .patterns import M, Pattern
+from .encodings import IDENTITY, compress, negotiate
+from .handlers import FileHandler
+from .index import RouteIndex
+from .latency import Bandwidth, Latency
+from .patterns import NO_CONTEXT, M, Matcher, Pattern, RequestView, optimize
 from .types import (
     CallableSideEffect,
     Content,
@@ -29,45 +42,466 @@ from .types import (
 )
 
 
+def is_single_pass(stream: Union[httpx.SyncByteStream, httpx.AsyncByteStream]) -> bool:
+    """
+    Returns True for a stream that can only be iterated once, e.g. a generator.
+    """
+    if isinstance(stream, httpx.ByteStream):
+        return False
+    source = getattr(stream, "_stream", None)  # Wrapped content of httpx streams
+    return isinstance(source, (Iterator, AsyncIterator))
+
+
 def clone_response(response: httpx.Response, request: httpx.Request) -> httpx.Response:
     """
     Clones a httpx Response for given request.
+
+    Single-pass streams are left unread, to be streamed straight to the client,
+    and are only buffered for call stats if the mocked response asks for it.
     """
+    stream = response.stream
+    streaming = is_single_pass(stream)
+    buffer = streaming and isinstance(response, MockResponse) and response.buffer
+
     response = httpx.Response(
         response.status_code,
         headers=response.headers,
-        stream=response.stream,
+        stream=stream,
         request=request,
         extensions=dict(response.extensions),
     )
-    if isinstance(response.stream, Iterable):
+    if buffer:
+        response.stream = BufferedStream(stream, response)
+    elif not streaming and isinstance(stream, Iterable):
         response.read()  # Pre-read stream for easier call stats usage
     return response
 
 
+class BufferedStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    """
+    Passes a response stream through, while buffering the streamed chunks
+    as content of given response, once fully streamed.
+    """
+
+    def __init__(
+        self,
+        stream: Union[httpx.SyncByteStream, httpx.AsyncByteStream],
+        response: httpx.Response,
+    ) -> None:
+        self.stream = stream
+        self.response = response
+
+    def __iter__(self) -> Iterator[bytes]:
+        chunks = []
+        for chunk in cast(httpx.SyncByteStream, self.stream):
+            chunks.append(chunk)
+            yield chunk
+        self.response._content = b"".join(chunks)
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        chunks = []
+        async for chunk in cast(httpx.AsyncByteStream, self.stream):
+            chunks.append(chunk)
+            yield chunk
+        self.response._content = b"".join(chunks)
+
+    def close(self) -> None:
+        cast(httpx.SyncByteStream, self.stream).close()
+
+    async def aclose(self) -> None:
+        await cast(httpx.AsyncByteStream, self.stream).aclose()
+
+
+class TemplateResponse(httpx.Response):
+    """
+    Response cloned from a prebuilt, pre-encoded, response template.
+    """
+
+    template: "ResponseTemplate"
+
+
+class ResponseTemplate:
+    """
+    Immutable prebuilt copy of a loaded, static, response, cloned per request.
+
+    Clones share the template's stream, body bytes and header items, with only
+    their request binding and extensions being their own.
+    """
+
+    __slots__ = (
+        "response",
+        "status_code",
+        "headers",
+        "raw_headers",
+        "stream",
+        "content",
+        "extensions",
+    )
+
+    def __init__(self, response: httpx.Response) -> None:
+        self.response = response
+        self.status_code = response.status_code
+        self.headers = httpx.Headers(response.headers)
+        self.raw_headers: List[Tuple[bytes, bytes]] = self.headers.raw
+        self.stream = response.stream
+        self.content: bytes = response.content
+        self.extensions = dict(response.extensions)
+
+    @classmethod
+    def of(cls, response: httpx.Response) -> Optional["ResponseTemplate"]:
+        """
+        Returns a template for given response, or None if having a streamed body.
+        """
+        if not isinstance(response.stream, httpx.ByteStream):
+            return None
+        if not hasattr(response, "_content"):
+            return None
+        return cls(response)
+
+    def is_current(self) -> bool:
+        """
+        Returns False if the templated response has been modified since prebuilt.
+        """
+        response = self.response
+        return (
+            response.status_code == self.status_code
+            and response.stream is self.stream
+            and response._content is self.content
+            and response.headers._list == self.headers._list
+            and response.extensions == self.extensions
+        )
+
+    def clone(self, request: httpx.Request) -> TemplateResponse:
+        response = TemplateResponse(
+            self.status_code,
+            headers=self.headers,
+            stream=self.stream,
+            request=request,
+            extensions=dict(self.extensions),
+        )
+        # Share loaded body, instead of re-reading the stream
+        response._content = self.content
+        response._num_bytes_downloaded = len(self.content)
+        response.is_stream_consumed = True
+        response.is_closed = True
+        response.template = self
+        return response
+
+
+class EncodedVariants:
+    """
+    Side effect serving pre-compressed variants of a loaded response, chosen by
+    the Accept-Encoding header of each request.
+    """
+
+    max_negotiated = 128
+    declines = False
+    reads_content = False
+
+    def __init__(self, response: httpx.Response, encodings: Sequence[str]) -> None:
+        if not isinstance(response.stream, httpx.ByteStream):
+            raise TypeError("Only static response content can be pre-compressed")
+
+        content = response.content
+        headers = httpx.Headers(response.headers)
+        headers["Vary"] = "Accept-Encoding"
+
+        # Compress variants up front, keeping server preference order
+        self.templates: Dict[str, ResponseTemplate] = {}
+        for encoding in encodings:
+            variant_headers = httpx.Headers(headers)
+            variant_headers["Content-Encoding"] = encoding
+            variant_headers.pop("Content-Length", None)
+            self.templates[encoding] = self.prebuild(
+                response, variant_headers, compress(content, encoding)
+            )
+        self.templates[IDENTITY] = self.prebuild(response, headers, content)
+
+        # Served when all variants, including identity, are excluded
+        self.not_acceptable = ResponseTemplate(
+            httpx.Response(406, headers={"Vary": "Accept-Encoding"}, content=b"")
+        )
+
+        # Negotiated variants, by Accept-Encoding header
+        self.negotiated: Dict[Optional[str], ResponseTemplate] = {}
+
+    @staticmethod
+    def prebuild(
+        response: httpx.Response, headers: httpx.Headers, content: bytes
+    ) -> ResponseTemplate:
+        return ResponseTemplate(
+            httpx.Response(
+                response.status_code,
+                headers=headers,
+                content=content,
+                extensions=dict(response.extensions),
+            )
+        )
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        header = request.headers.get("Accept-Encoding")
+        template = self.negotiated.get(header)
+        if template is None:
+            if len(self.negotiated) >= self.max_negotiated:
+                self.negotiated.clear()
+            encoding = negotiate(header, self.templates)
+            template = self.negotiated[header] = (
+                self.not_acceptable if encoding is None else self.templates[encoding]
+            )
+        return template.clone(request)
+
+
 class Call(NamedTuple):
     request: httpx.Request
     response: Optional[httpx.Response]
 
 
+def content_length(message: Union[httpx.Request, httpx.Response]) -> int:
+    """
+    Returns the byte size of a request or response body, either as read,
+    or as declared by its Content-Length header, if not yet read.
+    """
+    content = getattr(message, "_content", None)
+    if content is not None:
+        return len(content)
+    try:
+        return int(message.headers.get("Content-Length", 0))
+    except ValueError:
+        return 0
+
+
+class CallStats:
+    """
+    Aggregated call statistics, updated incrementally in constant memory.
+    """
+
+    __slots__ = (
+        "count",
+        "methods",
+        "statuses",
+        "exceptions",
+        "request_bytes",
+        "response_bytes",
+        "first",
+        "last",
+    )
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.methods: CounterType[str] = Counter()
+        self.statuses: CounterType[int] = Counter()
+        self.exceptions: CounterType[Type[BaseException]] = Counter()
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.first: Optional[float] = None  # Timestamps, in seconds since epoch
+        self.last: Optional[float] = None
+
+    def __repr__(self) -> str:  # pragma: nocover
+        return f"<CallStats count={self.count!r}>"
+
+    def copy(self) -> "CallStats":
+        stats = CallStats()
+        stats.restore(self)
+        return stats
+
+    def restore(self, stats: "CallStats") -> None:
+        self.count = stats.count
+        self.methods = stats.methods.copy()
+        self.statuses = stats.statuses.copy()
+        self.exceptions = stats.exceptions.copy()
+        self.request_bytes = stats.request_bytes
+        self.response_bytes = stats.response_bytes
+        self.first = stats.first
+        self.last = stats.last
+
+    def update(
+        self,
+        request: httpx.Request,
+        response: Optional[httpx.Response] = None,
+        error: Optional[BaseException] = None,
+        timestamp: Optional[float] = None,
+    ) -> None:
+        """
+        Counts a call, with either a response, a raised error, or neither
+        when passed through.
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        if self.first is None:
+            self.first = timestamp
+        self.last = timestamp
+        self.count += 1
+        self.methods[request.method] += 1
+        self.request_bytes += content_length(request)
+        if response is not None:
+            self.statuses[response.status_code] += 1
+            self.response_bytes += content_length(response)
+        if error is not None:
+            self.exceptions[type(error)] += 1
+
+
+class Recording:
+    """
+    Call recording policy, keeping all, none, the most recent or sampled calls.
+
+    Calls are sampled by either every Nth call, a random fraction of calls,
+    or a predicate of the call, and the sampled calls kept up to a max length.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        *,
+        maxlen: Optional[int] = None,
+        sample: Optional[Union[int, float, Callable[[Call], bool]]] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        if isinstance(sample, int) and sample < 1:
+            raise ValueError(f"Sample every Nth call must be at least 1, got {sample}")
+        if isinstance(sample, float) and not 0 <= sample <= 1:
+            raise ValueError(f"Sample fraction must be within 0-1, got {sample}")
+        self.enabled = enabled
+        self.maxlen = maxlen
+        self.sample = sample
+        self.random = random.Random(seed)
+
+    @classmethod
+    def of(cls, recording: Union[bool, "Recording"]) -> Optional["Recording"]:
+        """
+        Returns given recording policy, or None for recording all calls.
+        """
+        if isinstance(recording, Recording):
+            return recording
+        return None if recording else cls(enabled=False)
+
+    def keep(self, call: Call, count: int) -> bool:
+        """
+        Returns True if given call, counted as the Nth call, should be kept.
+        """
+        sample = self.sample
+        if sample is None:
+            return True
+        if isinstance(sample, int):
+            return count % sample == 0
+        if isinstance(sample, float):
+            return self.random.random() < sample
+        return bool(sample(call))
+
+
 class CallList(list, mock.NonCallableMock):
+    def __init__(
+        self, calls: Iterable[Call] = (), *, recording: Optional[Recording] = None
+    ) -> None:
+        super().__init__(calls)
+        # State is set past the mock's attribute guards
+        if isinstance(calls, CallList):
+            state = (
+                calls._recording,
+                calls._skipped,
+                calls._last,
+                calls.stats.copy(),
+                list(calls.latencies),
+            )
+        else:
+            last = self[-1] if self else None
+            state = (recording, 0, last, CallStats(), [None] * len(self))
+        self._set_state(*state)
+
+    def _set_state(
+        self,
+        recording: Optional[Recording],
+        skipped: int,
+        last: Optional[Call],
+        stats: CallStats,
+        latencies: List[Optional[float]],
+    ) -> None:
+        object.__setattr__(self, "_recording", recording)
+        object.__setattr__(self, "_skipped", skipped)  # Counted calls not kept
+        object.__setattr__(self, "_last", last)
+        object.__setattr__(self, "stats", stats)
+        # Simulated latency in seconds of each kept call, kept off the call tuples
+        object.__setattr__(self, "latencies", latencies)
+
     @property
     def called(self) -> bool:  # type: ignore
-        return bool(self)
+        return bool(self) or self._skipped > 0
 
     @property
     def call_count(self) -> int:  # type: ignore
-        return len(self)
+        return len(self) + self._skipped
+
+    @property
+    def recording(self) -> Optional[Recording]:
+        return self._recording
+
+    def clear(self) -> None:
+        super().clear()
+        self._set_state(self._recording, 0, None, CallStats(), [])
+
+    def restore(self, calls: "CallList") -> None:
+        """
+        Restores kept calls and counts, e.g. from a snapshot.
+        """
+        self[:] = calls
+        self.stats.restore(calls.stats)
+        self._set_state(
+            self._recording,
+            calls._skipped,
+            calls._last,
+            self.stats,
+            list(calls.latencies),
+        )
+
+    def skip(self) -> None:
+        """
+        Counts a call, without keeping it.
+        """
+        object.__setattr__(self, "_skipped", self._skipped + 1)
 
     @property
     def last(self) -> Optional[Call]:
-        return self[-1] if self else None
+        """
+        Last call, even if not kept by the recording policy.
+        """
+        return self._last
+
+    def add(
+        self,
+        call: Call,
+        recording: Optional[Recording] = None,
+        latency: Optional[float] = None,
+        *,
+        sampled: Optional[bool] = None,
+    ) -> None:
+        """
+        Adds a call, kept if sampled, by given decision or else by given, or own,
+        recording policy, and evicting the oldest kept call if exceeding its max length.
+        """
+        object.__setattr__(self, "_last", call)
+        recording = recording or self._recording
+        if sampled is None:
+            sampled = recording is None or recording.keep(call, self.call_count + 1)
+        if not sampled:
+            self.skip()
+            return
+
+        self.append(call)
+        self.latencies.append(latency)
+        if recording is None or recording.maxlen is None:
+            return
+        if len(self) > recording.maxlen:
+            del self[0]
+            del self.latencies[0]
+            self.skip()
 
     def record(
-        self, request: httpx.Request, response: Optional[httpx.Response]
+        self,
+        request: httpx.Request,
+        response: Optional[httpx.Response],
+        latency: Optional[float] = None,
     ) -> Call:
         call = Call(request=request, response=response)
-        self.append(call)
+        self.add(call, latency=latency)
         return call
 
 
@@ -79,6 +513,7 @@ class MockResponse(httpx.Response):
         content: Optional[Content] = None,
         content_type: Optional[str] = None,
         http_version: Optional[str] = None,
+        buffer: bool = False,
         **kwargs: Any,
     ) -> None:
         if not isinstance(content, (str, bytes)) and (
@@ -90,6 +525,7 @@ class MockResponse(httpx.Response):
             )
 
         super().__init__(status_code or 200, content=content, **kwargs)
+        self.buffer = buffer  # Buffer single-pass streamed content for call stats
 
         if content_type:
             self.headers["Content-Type"] = content_type
@@ -98,17 +534,37 @@ class MockResponse(httpx.Response):
 
 
 class Route:
+    __slots__ = (
+        "_pattern",
+        "_matcher",
+        "_return_value",
+        "_template",
+        "_side_effect",
+        "_pass_through",
+        "_latency",
+        "_bandwidth",
+        "_name",
+        "_snapshots",
+        "_owners",
+        "calls",
+    )
+
     def __init__(
         self,
         *patterns: Pattern,
         **lookups: Any,
     ) -> None:
         self._pattern = M(*patterns, **lookups)
+        self._matcher: Optional[Matcher] = None
         self._return_value: Optional[httpx.Response] = None
+        self._template: Optional[ResponseTemplate] = None
         self._side_effect: Optional[SideEffectTypes] = None
         self._pass_through: bool = False
+        self._latency: Optional[Latency] = None
+        self._bandwidth: Optional[Bandwidth] = None
         self._name: Optional[str] = None
         self._snapshots: List[Tuple] = []
+        self._owners: "WeakSet[RouteList]" = WeakSet()  # Route lists to invalidate
         self.calls = CallList()
         self.snapshot()
 
@@ -159,6 +615,26 @@ class Route:
     def pattern(self, pattern: Pattern) -> None:
         raise NotImplementedError("Can't change route pattern.")
 
+    def _set_pattern(self, pattern: Optional[Pattern]) -> None:
+        self._pattern = pattern
+        self._matcher = None
+        for routes in self._owners:
+            routes.invalidate()
+
+    def _changed_result(self) -> None:
+        """
+        Invalidates the resolved routes caches of the owning route lists.
+        """
+        for routes in self._owners:
+            routes.result_revision += 1
+
+    def compile(self) -> Optional[Matcher]:
+        """
+        Compiles route pattern into a match function, used when matching.
+        """
+        self._matcher = optimize(self._pattern).compile() if self._pattern else None
+        return self._matcher
+
     @property
     def return_value(self) -> Optional[httpx.Response]:
         return self._return_value
@@ -167,8 +643,9 @@ class Route:
     def return_value(self, return_value: Optional[httpx.Response]) -> None:
         if return_value is not None and not isinstance(return_value, httpx.Response):
             raise TypeError(f"{return_value!r} is not an instance of httpx.Response")
-        self.pass_through(False)
+        self._pass_through = False
         self._return_value = return_value
+        self._changed_result()
 
     @property
     def side_effect(self) -> Optional[SideEffectTypes]:
@@ -176,13 +653,49 @@ class Route:
 
     @side_effect.setter
     def side_effect(self, side_effect: Optional[SideEffectTypes]) -> None:
-        self.pass_through(False)
+        self._pass_through = False
+        replaced = self._side_effect
         if not side_effect:
             self._side_effect = None
         elif isinstance(side_effect, (tuple, list, Iterator)):
             self._side_effect = iter(side_effect)
         else:
             self._side_effect = side_effect
+        self._release(replaced)
+        self._changed_result()
+
+    def _release(self, side_effect: Optional[SideEffectTypes]) -> None:
+        """
+        Releases the memory-mapped file of a replaced file side effect,
+        which is re-mapped on demand if still in use, e.g. by a snapshot.
+        """
+        if (
+            isinstance(side_effect, FileHandler)
+            and side_effect is not self._side_effect
+        ):
+            side_effect.close()
+
+    @property
+    def latency(self) -> Optional[Latency]:
+        """
+        Latency model to delay mocked responses with, settable as fixed seconds.
+        """
+        return self._latency
+
+    @latency.setter
+    def latency(self, latency: Optional[Union[Latency, float]]) -> None:
+        self._latency = Latency.of(latency)
+
+    @property
+    def bandwidth(self) -> Optional[Bandwidth]:
+        """
+        Bandwidth to pace mocked response streams to, settable as bytes per second.
+        """
+        return self._bandwidth
+
+    @bandwidth.setter
+    def bandwidth(self, bandwidth: Optional[Union[Bandwidth, float]]) -> None:
+        self._bandwidth = Bandwidth.of(bandwidth)
 
     def snapshot(self) -> None:
         # Clone iterator-type side effect to not get pre-exhausted when rolled back
@@ -199,6 +712,8 @@ class Route:
                 self._return_value,
                 side_effect,
                 self._pass_through,
+                self._latency,
+                self._bandwidth,
                 CallList(self.calls),
             ),
         )
@@ -208,17 +723,33 @@ class Route:
             return
 
         snapshot = self._snapshots.pop()
-        pattern, name, return_value, side_effect, pass_through, calls = snapshot
-
-        self._pattern = pattern
+        (
+            pattern,
+            name,
+            return_value,
+            side_effect,
+            pass_through,
+            latency,
+            bandwidth,
+            calls,
+        ) = snapshot
+
+        if pattern is not self._pattern:
+            self._set_pattern(pattern)
         self._name = name
         self._return_value = return_value
-        self._side_effect = side_effect
-        self.pass_through(pass_through)
-        self.calls[:] = calls
+        replaced, self._side_effect = self._side_effect, side_effect
+        self._release(replaced)
+        self._pass_through = pass_through
+        self._changed_result()
+        self._latency = latency
+        self._bandwidth = bandwidth
+        self.calls.restore(calls)
 
     def reset(self) -> None:
         self.calls.clear()
+        if isinstance(self._side_effect, FileHandler):
+            self._side_effect.close()
 
     def mock(
         self,
@@ -242,8 +773,24 @@ class Route:
         stream: Optional[Union[httpx.SyncByteStream, httpx.AsyncByteStream]] = None,
         content_type: Optional[str] = None,
         http_version: Optional[str] = None,
+        buffer: bool = False,
+        file: Optional[Union[str, "os.PathLike[str]"]] = None,
+        encodings: Optional[Sequence[str]] = None,
         **kwargs: Any,
     ) -> "Route":
+        if file is not None:
+            if any(value is not None for value in (content, text, html, json, stream)):
+                raise TypeError("Route can't respond with both a file and content")
+            if encodings or http_version is not None or buffer or kwargs:
+                raise TypeError(
+                    "Route can't respond with a file and encodings, http_version, "
+                    "buffer or response kwargs"
+                )
+            handler = FileHandler(
+                file, status_code, headers=headers, content_type=content_type
+            )
+            return self.mock(side_effect=handler)
+
         response = MockResponse(
             status_code,
             headers=headers,
@@ -254,18 +801,59 @@ class Route:
             stream=stream,
             content_type=content_type,
             http_version=http_version,
+            buffer=buffer,
             **kwargs,
         )
-        return self.mock(return_value=response)
+        if encodings:
+            return self.mock(side_effect=EncodedVariants(response, encodings))
+
+        self.mock(return_value=response)
+        # Freeze pre-encoded response, to serve without re-encoding
+        self._template = ResponseTemplate.of(response)
+        return self
 
     def pass_through(self, value: bool = True) -> "Route":
         self._pass_through = value
+        self._changed_result()
         return self
 
     @property
     def is_pass_through(self) -> bool:
         return self._pass_through
 
+    def _may_call(self, trait: str) -> bool:
+        """
+        Returns True if the route's side effect may be called with the request,
+        and may have given trait, unless the callable declares not to have it.
+        """
+        effect = self._side_effect
+        if isinstance(effect, Iterator):
+            return True
+        if not callable(effect) or (
+            isinstance(effect, type) and issubclass(effect, Exception)
+        ):
+            return False
+        return getattr(effect, trait, True)
+
+    def _may_decline(self) -> bool:
+        """
+        Returns True if the route's side effect may resolve as a non-match.
+        """
+        return self._may_call("declines")
+
+    def _reads_content(self) -> bool:
+        """
+        Returns True if matching the route may read the request body, i.e. by a
+        content pattern, a custom pattern or a side effect getting the request.
+        """
+        if self._may_call("reads_content"):
+            return True
+        for pattern in self._pattern or ():
+            for _pattern in (pattern, pattern.base):
+                if _pattern is not None and _pattern.facet in ("content", None):
+                    return True
+        return False
+
     @property
     def called(self) -> bool:
         return self.calls.called
@@ -363,35 +951,71 @@ class Route:
 
         if isinstance(result, httpx.Response) and not result._request:
             # Clone reused Response for immutability
-            result = clone_response(result, request)
+            if result is self._return_value:
+                result = self._clone_return_value(result, request)
+            else:
+                result = clone_response(result, request)
 
         return result
 
-    def match(self, request: httpx.Request) -> RouteResultTypes:
+    def _clone_return_value(
+        self, response: httpx.Response, request: httpx.Request
+    ) -> httpx.Response:
+        """
+        Clones the static return value from its prebuilt template, when loaded.
+        """
+        template = self._template
+        if (
+            template is None
+            or template.response is not response
+            or not template.is_current()
+        ):
+            template = self._template = ResponseTemplate.of(response)
+        if template is None:
+            return clone_response(response, request)
+        return template.clone(request)
+
+    def match(self, request: Union[httpx.Request, RequestView]) -> RouteResultTypes:
         """
         Matches and resolves request with given patterns and optional side effect.
 
         Returns None for a non-matching route, mocked response for a match,
         or input request for pass-through.
         """
-        context = {}
+        if isinstance(request, RequestView):
+            view, request = request, request.request
+        else:
+            view = RequestView(request)
+
+        context = self._match_pattern(view)
+        if context is None:
+            return None
 
-        if self._pattern:
-            match = self.pattern.match(request)
-            if not match:
-                return None
-            context = match.context
+        return self._resolve_match(request, context)
+
+    def _match_pattern(self, view: RequestView) -> Optional[Mapping[str, Any]]:
+        """
+        Returns matched context, or None for a non-matching route pattern.
+        """
+        if not self._pattern:
+            return NO_CONTEXT
+        matcher = self._matcher or self.compile()
+        return matcher(view)
 
+    def _resolve_match(
+        self, request: httpx.Request, context: Mapping[str, Any]
+    ) -> RouteResultTypes:
         if self._pass_through:
             return request
-
-        result = self.resolve(request, **context)
-        return result
+        return self.resolve(request, **context)
 
 
 class RouteList:
     _routes: List[Route]
     _names: Dict[str, Route]
+    _index: Optional[RouteIndex]
+    revision: int  # Bumped on any change
+    result_revision: int  # Bumped on any route result change
 
     def __init__(self, routes: Optional["RouteList"] = None) -> None:
         if routes is None:
@@ -400,6 +1024,10 @@ class RouteList:
         else:
             self._routes = list(routes._routes)
             self._names = dict(routes._names)
+        self._index = None
+        self.revision = 0
+        self.result_revision = 0
+        self._own()
 
     def __repr__(self) -> str:
         return repr(self._routes)  # pragma: nocover
@@ -428,26 +1056,67 @@ class RouteList:
         """
         self._routes = list(routes._routes)
         self._names = dict(routes._names)
+        self._own()
+        self.invalidate()
+
+    def _own(self) -> None:
+        """
+        Registers this list with its routes, to get invalidated by their changes.
+        """
+        for route in self._routes:
+            route._owners.add(self)
+
+    @property
+    def index(self) -> RouteIndex:
+        """
+        Dispatch index of current routes, lazily (re-)built when invalidated.
+        """
+        index = self._index
+        if index is None:
+            index = RouteIndex()
+            for route in self._routes:
+                index.add(route.pattern)
+            self._index = index
+        return index
+
+    def invalidate(self) -> None:
+        """
+        Drops dispatch index, e.g. when routes or their patterns have changed.
+        """
+        self._index = None
+        self.revision += 1
+
+    def candidates(self, request: Union[httpx.Request, RequestView]) -> List[Route]:
+        """
+        Returns the routes that may match given request, in priority order.
+        """
+        routes = self._routes
+        view = RequestView.of(request)
+        return [routes[position] for position in self.index.lookup(view)]
 
     def clear(self) -> None:
+        for route in self._routes:
+            route._owners.discard(self)
         self._routes.clear()
         self._names.clear()
+        self.invalidate()
 
     def add(self, route: Route, name: Optional[str] = None) -> Route:
         # Find route with same name
         existing_route = self._names.pop(name, None)
 
-        if route in self._routes:
+        # Find route with same pattern, by index instead of comparing all routes
+        index = self.index.positions.get(route.pattern)
+        if index is not None:
             if existing_route and existing_route != route:
                 # Re-use existing route with same name, and drop any with same pattern
-                index = self._routes.index(route)
                 same_pattern_route = self._routes.pop(index)
+                self.invalidate()
                 if same_pattern_route.name:
                     del self._names[same_pattern_route.name]
                     same_pattern_route._name = None
             elif not existing_route:
                 # Re-use existing route with same pattern
-                index = self._routes.index(route)
                 existing_route = self._routes[index]
                 if existing_route.name:
                     del self._names[existing_route.name]
@@ -455,14 +1124,19 @@ class RouteList:
 
         if existing_route:
             # Update existing route's pattern and mock
-            existing_route._pattern = route._pattern
+            existing_route._set_pattern(route._pattern)
             existing_route.return_value = route.return_value
             existing_route.side_effect = route.side_effect
             existing_route.pass_through(route.is_pass_through)
+            existing_route._latency = route._latency
+            existing_route._bandwidth = route._bandwidth
             route = existing_route
         else:
             # Add new route
             self._routes.append(route)
+            route._owners.add(self)
+            self.revision += 1
+            self.index.add(route.pattern)
 
         if name:
             route._name = name
@@ -479,6 +1153,8 @@ class RouteList:
         try:
             route = self._names.pop(name)
             self._routes.remove(route)
+            route._owners.discard(self)
+            self.invalidate()
             return route
         except KeyError as ex:
             if default is ...:
@@ -500,6 +1176,9 @@ class PassThrough(Exception):
 
 
 class ResolvedRoute:
+    __slots__ = ("route", "response", "latency")
+
     def __init__(self):
         self.route: Optional[Route] = None
         self.response: Optional[ResolvedResponseTypes] = None
+        self.latency: Optional[float] = None
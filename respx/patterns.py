@@ -2,6 +2,7 @@ import json as jsonlib
 import operator
 import re
 from abc import ABC
+from collections import Counter
 from enum import Enum
 from functools import reduce
 from http.cookies import SimpleCookie
@@ -11,12 +12,15 @@ from typing import (
     Any,
     Callable,
     ClassVar,
+    Counter as TCounter,
     Dict,
+    FrozenSet,
+    Hashable,
     List,
+    Mapping,
     Optional,
     Pattern as RegexPattern,
     Sequence,
-    Set,
     Tuple,
     Type,
     Union,
@@ -25,6 +29,7 @@ from urllib.parse import urljoin
 
 import httpx
 
+from . import jsonpath
 from .types import CookieTypes, HeaderTypes, QueryParamTypes, URLPatternTypes
 
 
@@ -36,25 +41,196 @@ class Lookup(Enum):
     IN = "in"
 
 
+class facet:
+    """
+    Memoized request view facet, i.e. parsed once per view.
+    """
+
+    def __init__(self, parse: Callable[["RequestView"], Any]) -> None:
+        self.parse = parse
+        self.name = parse.__name__
+        self.__doc__ = parse.__doc__
+
+    def __get__(self, view: Optional["RequestView"], owner: Type) -> Any:
+        if view is None:
+            return self  # pragma: nocover
+        value = view.__dict__[self.name] = self.parse(view)
+        return value
+
+
+class RequestView:
+    """
+    Read-only view of a `httpx.Request`, shared by all patterns matched against
+    the request, with parsed request values memoized as facets.
+
+    Any other attribute is proxied to the request.
+    """
+
+    def __init__(self, request: httpx.Request) -> None:
+        self.request = request
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.request, name)
+
+    def __repr__(self):  # pragma: nocover
+        return f"<RequestView {self.request!r}>"
+
+    def fingerprint(self, facets: Sequence[str]) -> Tuple[Hashable, ...]:
+        """
+        Returns hashable values of given facets, identifying the request.
+        """
+        values: List[Hashable] = []
+        for name in facets:
+            value = getattr(self, name)
+            if isinstance(value, Counter):
+                value = frozenset(value.items())
+            values.append(value)
+        return tuple(values)
+
+    @classmethod
+    def of(cls, request: Union[httpx.Request, "RequestView"]) -> "RequestView":
+        if isinstance(request, RequestView):
+            return request
+        return cls(request)
+
+    @facet
+    def method(self) -> str:
+        return self.request.method
+
+    @facet
+    def scheme(self) -> str:
+        return self.request.url.scheme
+
+    @facet
+    def host(self) -> str:
+        return self.request.url.host
+
+    @facet
+    def port(self) -> Optional[int]:
+        url = self.request.url
+        return url.port or get_scheme_port(url.scheme)
+
+    @facet
+    def path(self) -> str:
+        return self.request.url.path
+
+    @facet
+    def normalized_url(self) -> str:
+        return str(ensure_path(self.request.url))
+
+    @facet
+    def query_items(self) -> TCounter[Tuple[str, str]]:
+        return Counter(httpx.QueryParams(self.request.url.query).multi_items())
+
+    @facet
+    def header_items(self) -> TCounter[Tuple[str, str]]:
+        """
+        Header items, with lower cased names.
+        """
+        return Counter(self.request.headers.multi_items())
+
+    @facet
+    def cookie_items(self) -> FrozenSet[Tuple[str, str]]:
+        return parse_cookie_header(self.request.headers.get("cookie"))
+
+    @facet
+    def content(self) -> bytes:
+        return self.request.read()
+
+    @facet
+    def json(self) -> Any:
+        """
+        Decoded JSON content, or `INVALID_JSON` when not decodable.
+        """
+        try:
+            return jsonlib.loads(self.content.decode("utf-8"))
+        except JSONDecodeError:
+            return INVALID_JSON
+
+    def json_path(self, path: Tuple[Union[str, int], ...]) -> Any:
+        """
+        Value at given path of JSON content, scanned without decoding the whole
+        document, or `INVALID_JSON` when not decodable. Memoized per path.
+        """
+        values = self.__dict__.setdefault("json_paths", {})
+        if path not in values:
+            try:
+                values[path] = jsonpath.extract(self.content, path)
+            except (KeyError, IndexError):
+                raise
+            except ValueError:
+                values[path] = INVALID_JSON
+        return values[path]
+
+
+INVALID_JSON = object()
+
+EMPTY_COOKIES: FrozenSet[Tuple[str, str]] = frozenset()
+COOKIE_ITEM_REGEX = re.compile(
+    r"[\w!#%&'~`*+\-.^|]+=[\w!#%&'~`*+\-.^|$:/@()?{}<>\[\]=]*", re.ASCII
+)
+COOKIE_ATTRIBUTES = frozenset(
+    (
+        "expires",
+        "path",
+        "comment",
+        "domain",
+        "max-age",
+        "secure",
+        "httponly",
+        "version",
+        "samesite",
+    )
+)
+
+# Compiled pattern, returning matched context, or None for a non-match
+Matcher = Callable[[RequestView], Optional[Mapping[str, Any]]]
+Lookuper = Callable[[Any], Optional[Mapping[str, Any]]]
+NO_CONTEXT: Mapping[str, Any] = MappingProxyType({})
+
+
 class Match:
+    """
+    Immutable pattern match result, with any matched context.
+
+    Use the shared `TRUE` and `FALSE` matches when there is no context.
+    """
+
+    __slots__ = ("matches", "context")
+
+    matches: bool
+    context: Mapping[str, Any]
+
     def __init__(self, matches: bool, **context: Any) -> None:
-        self.matches = matches
-        self.context = context
+        object.__setattr__(self, "matches", bool(matches))
+        object.__setattr__(self, "context", context or NO_CONTEXT)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{self!r} is immutable")
 
     def __bool__(self):
-        return bool(self.matches)
+        return self.matches
 
     def __invert__(self):
-        self.matches = not self.matches
-        return self
+        if self.context:
+            return Match(not self.matches, **self.context)
+        return FALSE if self.matches else TRUE
 
     def __repr__(self):  # pragma: nocover
         return f"<Match {self.matches}>"
 
 
+TRUE = Match(True)
+FALSE = Match(False)
+
+
 class Pattern(ABC):
+    __slots__ = ("lookup", "base", "value")
+
     key: ClassVar[str]
     lookups: ClassVar[Tuple[Lookup, ...]] = (Lookup.EQUAL,)
+    cost: ClassVar[int] = 4  # Estimated relative cost of parsing and matching
+    facet: ClassVar[Optional[str]] = None  # Request view facet read by pattern
 
     lookup: Lookup
     base: Optional["Pattern"]
@@ -112,7 +288,7 @@ class Pattern(ABC):
         """
         return value
 
-    def parse(self, request: httpx.Request) -> Any:  # pragma: nocover
+    def parse(self, request: RequestView) -> Any:  # pragma: nocover
         """
         Parse and return request value to match with pattern value.
         """
@@ -121,8 +297,26 @@ class Pattern(ABC):
     def strip_base(self, value: Any) -> Any:  # pragma: nocover
         return value
 
-    def match(self, request: httpx.Request) -> Match:
-        value = self.parse(request)
+    def estimate_cost(self) -> int:
+        return self.cost + (1 if self.lookup is Lookup.REGEX else 0)
+
+    def may_raise(self) -> bool:
+        """
+        Returns True if matching may raise, e.g. on a missing JSON path.
+        """
+        return False
+
+    def has_context(self) -> bool:
+        """
+        Returns True if pattern may capture context when matched.
+        """
+        return any(
+            pattern.lookup is Lookup.REGEX or type(pattern).match is not Pattern.match
+            for pattern in self
+        )
+
+    def match(self, request: Union[httpx.Request, RequestView]) -> Match:
+        value = self.parse(RequestView.of(request))
 
         # Match and strip base
         if self.base:
@@ -138,25 +332,131 @@ class Pattern(ABC):
         return lookup_method(value)
 
     def _eq(self, value: Any) -> Match:
-        return Match(value == self.value)
+        return TRUE if value == self.value else FALSE
 
     def _regex(self, value: str) -> Match:
         match = self.value.search(value)
         if match is None:
-            return Match(False)
-        return Match(True, **match.groupdict())
+            return FALSE
+        context = match.groupdict()
+        return Match(True, **context) if context else TRUE
 
     def _startswith(self, value: str) -> Match:
-        return Match(value.startswith(self.value))
+        return TRUE if value.startswith(self.value) else FALSE
 
     def _contains(self, value: Any) -> Match:  # pragma: nocover
         raise NotImplementedError()
 
     def _in(self, value: Any) -> Match:
-        return Match(value in self.value)
+        return TRUE if value in self.value else FALSE
+
+    def compile(self) -> Matcher:
+        """
+        Compiles pattern into a specialized match function,
+        with lookup and any base stripping bound up front.
+        """
+        if type(self).match is not Pattern.match:
+            return self._compile_interpreted()
+
+        parse = self.parse
+        lookup = self._compile_lookup()
+
+        if not self.base:
+
+            def match(request: RequestView) -> Optional[Mapping[str, Any]]:
+                return lookup(parse(request))
+
+            return match
+
+        base_lookup = self.base._compile_lookup()
+        strip_base = self._compile_strip_base()
+
+        def match_base(request: RequestView) -> Optional[Mapping[str, Any]]:
+            value = parse(request)
+            if base_lookup(value) is None:
+                return None
+            if strip_base:
+                value = strip_base(value)
+            return lookup(value)
+
+        return match_base
+
+    def _compile_interpreted(self) -> Matcher:
+        pattern_match = self.match
+
+        def match(request: RequestView) -> Optional[Mapping[str, Any]]:
+            _match = pattern_match(request)
+            return _match.context if _match else None
+
+        return match
+
+    def _compile_strip_base(self) -> Optional[Callable[[Any], Any]]:
+        if type(self).strip_base is Pattern.strip_base:
+            return None
+        return self.strip_base
+
+    def _compile_lookup(self) -> Lookuper:
+        name = f"_{self.lookup.value}"
+        compile_name = f"_compile{name}"
+        if getattr(type(self), name) is not getattr(Pattern, name) and getattr(
+            type(self), compile_name
+        ) is getattr(Pattern, compile_name):
+            # Overridden lookup method, without a compiled counterpart
+            lookup_method = getattr(self, name)
+
+            def lookup(value: Any) -> Optional[Mapping[str, Any]]:
+                match = lookup_method(value)
+                return match.context if match else None
+
+            return lookup
+
+        return getattr(self, compile_name)()
+
+    def _compile_eq(self) -> Lookuper:
+        expected = self.value
+
+        def eq(value: Any) -> Optional[Mapping[str, Any]]:
+            return NO_CONTEXT if value == expected else None
+
+        return eq
+
+    def _compile_regex(self) -> Lookuper:
+        search = self.value.search
+
+        def regex(value: Any) -> Optional[Mapping[str, Any]]:
+            match = search(value)
+            return None if match is None else match.groupdict()
+
+        return regex
+
+    def _compile_startswith(self) -> Lookuper:
+        prefix = self.value
+
+        def startswith(value: Any) -> Optional[Mapping[str, Any]]:
+            return NO_CONTEXT if value.startswith(prefix) else None
+
+        return startswith
+
+    def _compile_contains(self) -> Lookuper:  # pragma: nocover
+        raise NotImplementedError()
+
+    def _compile_in(self) -> Lookuper:
+        values = self.value
+        if not isinstance(values, str):
+            try:
+                values = frozenset(values)
+            except TypeError:
+                pass  # Unhashable values
+
+        def in_(value: Any) -> Optional[Mapping[str, Any]]:
+            return NO_CONTEXT if value in values else None
+
+        return in_
 
 
 class PathPattern(Pattern):
+    __slots__ = ("path",)
+
     path: Optional[str]
 
     def __init__(
@@ -165,49 +465,111 @@ class PathPattern(Pattern):
         self.path = path
         super().__init__(value, lookup)
 
+    def __hash__(self):
+        return hash((self.__class__, self.lookup, self.path, self.value))
+
 
 class _And(Pattern):
-    value: Tuple[Pattern, Pattern]
+    __slots__ = ()
+
+    value: Tuple[Pattern, ...]
 
     def __repr__(self):  # pragma: nocover
-        a, b = self.value
-        return f"{repr(a)} AND {repr(b)}"
+        return " AND ".join(repr(pattern) for pattern in self.value)
 
     def __iter__(self):
-        a, b = self.value
-        yield from a
-        yield from b
-
-    def match(self, request: httpx.Request) -> Match:
-        a, b = self.value
-        match1 = a.match(request)
-        match2 = b.match(request)
-        if match1 and match2:
-            return Match(True, **{**match1.context, **match2.context})
-        return Match(False)
+        for pattern in self.value:
+            yield from pattern
+
+    def estimate_cost(self) -> int:
+        return sum(pattern.estimate_cost() for pattern in self.value)
+
+    def may_raise(self) -> bool:
+        return any(pattern.may_raise() for pattern in self.value)
+
+    def match(self, request: Union[httpx.Request, RequestView]) -> Match:
+        request = RequestView.of(request)
+        context: Dict[str, Any] = {}
+        for pattern in self.value:
+            match = pattern.match(request)
+            if not match:
+                return FALSE
+            if match.context:
+                context.update(match.context)
+        return Match(True, **context) if context else TRUE
+
+    def compile(self) -> Matcher:
+        # Evaluate cheapest operands first, but merge contexts in operand order
+        matchers = tuple((i, self.value[i].compile()) for i in cost_order(self.value))
+
+        def and_(request: RequestView) -> Optional[Mapping[str, Any]]:
+            contexts = []
+            for i, matcher in matchers:
+                context = matcher(request)
+                if context is None:
+                    return None
+                if context:
+                    contexts.append((i, context))
+
+            if not contexts:
+                return NO_CONTEXT
+            if len(contexts) == 1:
+                return contexts[0][1]
+
+            merged: Dict[str, Any] = {}
+            for __, context in sorted(contexts, key=lambda context: context[0]):
+                merged.update(context)
+            return merged
+
+        return and_
 
 
 class _Or(Pattern):
-    value: Tuple[Pattern, Pattern]
+    __slots__ = ()
+
+    value: Tuple[Pattern, ...]
 
     def __repr__(self):  # pragma: nocover
-        a, b = self.value
-        return f"{repr(a)} OR {repr(b)}"
+        return " OR ".join(repr(pattern) for pattern in self.value)
 
     def __iter__(self):
-        a, b = self.value
-        yield from a
-        yield from b
-
-    def match(self, request: httpx.Request) -> Match:
-        a, b = self.value
-        match = a.match(request)
-        if not match:
-            match = b.match(request)
-        return match
+        for pattern in self.value:
+            yield from pattern
+
+    def estimate_cost(self) -> int:
+        return sum(pattern.estimate_cost() for pattern in self.value)
+
+    def may_raise(self) -> bool:
+        return any(pattern.may_raise() for pattern in self.value)
+
+    def match(self, request: Union[httpx.Request, RequestView]) -> Match:
+        request = RequestView.of(request)
+        for pattern in self.value:
+            match = pattern.match(request)
+            if match:
+                return match
+        return FALSE
+
+    def compile(self) -> Matcher:
+        operands = self.value
+        if not any(pattern.has_context() for pattern in operands):
+            # First match wins, so only reorder when no operand captures context
+            operands = tuple(operands[i] for i in cost_order(operands))
+        matchers = tuple(pattern.compile() for pattern in operands)
+
+        def or_(request: RequestView) -> Optional[Mapping[str, Any]]:
+            for matcher in matchers:
+                context = matcher(request)
+                if context is not None:
+                    return context
+            return None
+
+        return or_
 
 
 class _Invert(Pattern):
+    __slots__ = ()
+
     value: Pattern
 
     def __repr__(self):  # pragma: nocover
@@ -216,12 +578,30 @@ class _Invert(Pattern):
     def __iter__(self):
         yield from self.value
 
-    def match(self, request: httpx.Request) -> Match:
+    def estimate_cost(self) -> int:
+        return self.value.estimate_cost()
+
+    def may_raise(self) -> bool:
+        return self.value.may_raise()
+
+    def match(self, request: Union[httpx.Request, RequestView]) -> Match:
         return ~self.value.match(request)
 
+    def compile(self) -> Matcher:
+        pattern = self.value.compile()
+
+        def invert(request: RequestView) -> Optional[Mapping[str, Any]]:
+            return NO_CONTEXT if pattern(request) is None else None
+
+        return invert
+
 
 class Method(Pattern):
+    __slots__ = ()
+
     key = "method"
+    cost = 1
+    facet = "method"
     lookups = (Lookup.EQUAL, Lookup.IN)
     value: Union[str, Sequence[str]]
 
@@ -233,75 +613,116 @@ class Method(Pattern):
             value = tuple(v.upper() for v in value)
         return value
 
-    def parse(self, request: httpx.Request) -> str:
+    def parse(self, request: RequestView) -> str:
         return request.method
 
 
 class MultiItemsMixin:
+    """
+    Matches multi items as multisets, precomputed as a `Counter` of pattern items.
+    """
+
+    __slots__ = ()
+
     lookup: Lookup
     value: Any
+    items: TCounter[Tuple[str, str]]
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        # Slot of the concrete pattern class
+        self.items = Counter(self.value.multi_items())  # type: ignore[misc]
 
     def __hash__(self):
-        return hash((self.__class__, self.lookup, str(self.value)))
+        return hash((self.__class__, self.lookup, frozenset(self.items.items())))
+
+    def _eq(self, value: TCounter[Tuple[str, str]]) -> Match:
+        return TRUE if value == self.items else FALSE
+
+    def _contains(self, value: TCounter[Tuple[str, str]]) -> Match:
+        if len(self.items) > len(value):
+            return FALSE
+
+        for item, count in self.items.items():
+            if value[item] < count:
+                return FALSE
+
+        return TRUE
+
+    def _compile_eq(self) -> Lookuper:
+        expected = self.items
 
-    def _contains(self, value: Any) -> Match:
-        value_list = self.value.multi_items()
-        request_list = value.multi_items()
+        def eq(value: Any) -> Optional[Mapping[str, Any]]:
+            return NO_CONTEXT if value == expected else None
 
-        if len(value_list) > len(request_list):
-            return Match(False)
+        return eq
 
-        for item in value_list:
-            if item not in request_list:
-                return Match(False)
+    def _compile_contains(self) -> Lookuper:
+        items = tuple(self.items.items())
 
-        return Match(True)
+        def contains(value: Any) -> Optional[Mapping[str, Any]]:
+            if len(items) > len(value):
+                return None
+            for item, count in items:
+                if value[item] < count:
+                    return None
+            return NO_CONTEXT
+
+        return contains
 
 
 class Headers(MultiItemsMixin, Pattern):
+    __slots__ = ("items",)
+
     key = "headers"
+    cost = 4
+    facet = "header_items"
     lookups = (Lookup.CONTAINS, Lookup.EQUAL)
     value: httpx.Headers
 
     def clean(self, value: HeaderTypes) -> httpx.Headers:
         return httpx.Headers(value)
 
-    def parse(self, request: httpx.Request) -> httpx.Headers:
-        return request.headers
+    def parse(self, request: RequestView) -> TCounter[Tuple[str, str]]:
+        return request.header_items
 
 
 class Cookies(Pattern):
+    __slots__ = ()
+
     key = "cookies"
+    cost = 5
+    facet = "cookie_items"
     lookups = (Lookup.CONTAINS, Lookup.EQUAL)
-    value: Set[Tuple[str, str]]
-
-    def __hash__(self):
-        return hash((self.__class__, self.lookup, tuple(sorted(self.value))))
+    value: FrozenSet[Tuple[str, str]]
 
-    def clean(self, value: CookieTypes) -> Set[Tuple[str, str]]:
+    def clean(self, value: CookieTypes) -> FrozenSet[Tuple[str, str]]:
         if isinstance(value, dict):
-            return set(value.items())
+            return frozenset(value.items())
 
-        return set(value)
+        return frozenset(value)
 
-    def parse(self, request: httpx.Request) -> Set[Tuple[str, str]]:
-        headers = request.headers
+    def parse(self, request: RequestView) -> FrozenSet[Tuple[str, str]]:
+        return request.cookie_items
 
-        cookie_header = headers.get("cookie")
-        if not cookie_header:
-            return set()
+    def _contains(self, value: FrozenSet[Tuple[str, str]]) -> Match:
+        return TRUE if not self.value.isdisjoint(value) else FALSE
 
-        cookies: SimpleCookie = SimpleCookie()
-        cookies.load(rawdata=cookie_header)
+    def _compile_contains(self) -> Lookuper:
+        isdisjoint = self.value.isdisjoint
 
-        return {(cookie.key, cookie.value) for cookie in cookies.values()}
+        def contains(value: Any) -> Optional[Mapping[str, Any]]:
+            return None if isdisjoint(value) else NO_CONTEXT
 
-    def _contains(self, value: Set[Tuple[str, str]]) -> Match:
-        return Match(bool(self.value & value))
+        return contains
 
 
 class Scheme(Pattern):
+    __slots__ = ()
+
     key = "scheme"
+    cost = 2
+    facet = "scheme"
     lookups = (Lookup.EQUAL, Lookup.IN)
     value: Union[str, Sequence[str]]
 
@@ -313,76 +734,111 @@ class Scheme(Pattern):
             value = tuple(v.lower() for v in value)
         return value
 
-    def parse(self, request: httpx.Request) -> str:
-        return request.url.scheme
+    def parse(self, request: RequestView) -> str:
+        return request.scheme
 
 
 class Host(Pattern):
+    __slots__ = ()
+
     key = "host"
+    cost = 2
+    facet = "host"
     lookups = (Lookup.EQUAL, Lookup.REGEX, Lookup.IN)
     value: Union[str, RegexPattern[str], Sequence[str]]
 
     def clean(
-        self, value: Union[str, RegexPattern[str]]
-    ) -> Union[str, RegexPattern[str]]:
+        self, value: Union[str, RegexPattern[str], Sequence[str]]
+    ) -> Union[str, RegexPattern[str], Sequence[str]]:
         if self.lookup is Lookup.REGEX and isinstance(value, str):
             value = re.compile(value)
+        elif self.lookup is Lookup.IN and isinstance(value, (list, set)):
+            value = tuple(value)
         return value
 
-    def parse(self, request: httpx.Request) -> str:
-        return request.url.host
+    def parse(self, request: RequestView) -> str:
+        return request.host
 
 
 class Port(Pattern):
+    __slots__ = ()
+
     key = "port"
+    cost = 2
+    facet = "port"
     lookups = (Lookup.EQUAL, Lookup.IN)
-    value: Optional[int]
+    value: Union[Optional[int], Sequence[int]]
+
+    def clean(
+        self, value: Union[Optional[int], Sequence[int]]
+    ) -> Union[Optional[int], Sequence[int]]:
+        if self.lookup is Lookup.IN and isinstance(value, (list, set)):
+            value = tuple(value)
+        return value
 
-    def parse(self, request: httpx.Request) -> Optional[int]:
-        scheme = request.url.scheme
-        port = request.url.port
-        scheme_port = get_scheme_port(scheme)
-        return port or scheme_port
+    def parse(self, request: RequestView) -> Optional[int]:
+        return request.port
 
 
 class Path(Pattern):
+    __slots__ = ()
+
     key = "path"
+    cost = 3
+    facet = "path"
     lookups = (Lookup.EQUAL, Lookup.REGEX, Lookup.STARTS_WITH, Lookup.IN)
     value: Union[str, Sequence[str], RegexPattern[str]]
 
     def clean(
-        self, value: Union[str, RegexPattern[str]]
-    ) -> Union[str, RegexPattern[str]]:
+        self, value: Union[str, RegexPattern[str], Sequence[str]]
+    ) -> Union[str, RegexPattern[str], Sequence[str]]:
         if self.lookup in (Lookup.EQUAL, Lookup.STARTS_WITH) and isinstance(value, str):
             path = urljoin("/", value)  # Ensure leading slash
             value = httpx.URL(path).path
         elif self.lookup is Lookup.REGEX and isinstance(value, str):
             value = re.compile(value)
+        elif self.lookup is Lookup.IN and isinstance(value, (list, set)):
+            value = tuple(value)
         return value
 
-    def parse(self, request: httpx.Request) -> str:
-        return request.url.path
+    def parse(self, request: RequestView) -> str:
+        return request.path
 
     def strip_base(self, value: str) -> str:
         value = urljoin("/", value[len(self.base.value) :])
         return value
 
+    def _compile_strip_base(self) -> Optional[Callable[[Any], Any]]:
+        base_length = len(self.base.value)
+
+        def strip_base(value: str) -> str:
+            return urljoin("/", value[base_length:])
+
+        return strip_base
+
 
 class Params(MultiItemsMixin, Pattern):
+    __slots__ = ("items",)
+
     key = "params"
+    cost = 4
+    facet = "query_items"
     lookups = (Lookup.CONTAINS, Lookup.EQUAL)
     value: httpx.QueryParams
 
     def clean(self, value: QueryParamTypes) -> httpx.QueryParams:
         return httpx.QueryParams(value)
 
-    def parse(self, request: httpx.Request) -> httpx.QueryParams:
-        query = request.url.query
-        return httpx.QueryParams(query)
+    def parse(self, request: RequestView) -> TCounter[Tuple[str, str]]:
+        return request.query_items
 
 
 class URL(Pattern):
+    __slots__ = ()
+
     key = "url"
+    cost = 3
+    facet = "normalized_url"
     lookups = (
         Lookup.EQUAL,
         Lookup.REGEX,
@@ -393,9 +849,7 @@ class URL(Pattern):
     def clean(self, value: URLPatternTypes) -> Union[str, RegexPattern[str]]:
         url: Union[str, RegexPattern[str]]
         if self.lookup is Lookup.EQUAL and isinstance(value, (str, tuple, httpx.URL)):
-            _url = httpx.URL(value)
-            _url = self._ensure_path(_url)
-            url = str(_url)
+            url = str(ensure_path(httpx.URL(value)))
         elif self.lookup is Lookup.REGEX and isinstance(value, str):
             url = re.compile(value)
         elif isinstance(value, (str, RegexPattern)):
@@ -404,24 +858,23 @@ class URL(Pattern):
             raise ValueError(f"Invalid url: {value!r}")
         return url
 
-    def parse(self, request: httpx.Request) -> str:
-        url = request.url
-        url = self._ensure_path(url)
-        return str(url)
-
-    def _ensure_path(self, url: httpx.URL) -> httpx.URL:
-        if not url._uri_reference.path:
-            url = url.copy_with(path="/")
-        return url
+    def parse(self, request: RequestView) -> str:
+        return request.normalized_url
 
 
 class ContentMixin:
-    def parse(self, request: httpx.Request) -> Any:
-        content = request.read()
-        return content
+    __slots__ = ()
+
+    cost = 6
+    facet = "content"
+
+    def parse(self, request: RequestView) -> Any:
+        return request.content
 
 
 class Content(ContentMixin, Pattern):
+    __slots__ = ()
+
     lookups = (Lookup.EQUAL,)
     key = "content"
     value: bytes
@@ -433,40 +886,120 @@ class Content(ContentMixin, Pattern):
 
 
 class JSON(ContentMixin, PathPattern):
+    __slots__ = ("accessors", "expected", "strict")
+
     lookups = (Lookup.EQUAL,)
     key = "json"
+    # Min content size to scan for path, instead of decoding the whole document,
+    # opted into since scanning neither validates nor picks the last duplicate key
+    stream_threshold: ClassVar[Optional[int]] = None
     value: str
+    accessors: Tuple[Union[str, int], ...]
+    expected: Any
+    strict: bool
+
+    def __init__(
+        self, value: Any, lookup: Optional[Lookup] = None, *, path: Optional[str] = None
+    ) -> None:
+        super().__init__(value, lookup, path=path)
+        self.accessors = tuple(
+            int(bit) if bit.isdigit() else bit
+            for bit in (path.split("__") if path else ())
+        )
+        # Decoded canonical value, compared structurally with request json
+        self.expected = jsonlib.loads(self.value)
+        self.strict = has_numbers(self.expected)
 
     def clean(self, value: Union[str, List, Dict]) -> str:
         return self.hash(value)
 
-    def parse(self, request: httpx.Request) -> str:
-        content = super().parse(request)
-        try:
-            json = jsonlib.loads(content.decode("utf-8"))
-        except JSONDecodeError:
-            return ""
-
-        if self.path:
-            value = json
-            for bit in self.path.split("__"):
-                key = int(bit) if bit.isdigit() else bit
-                try:
-                    value = value[key]
-                except KeyError as e:
-                    raise KeyError(f"{self.path!r} not in {json!r}") from e
-                except IndexError as e:
-                    raise IndexError(f"{self.path!r} not in {json!r}") from e
-        else:
-            value = json
+    def may_raise(self) -> bool:
+        return bool(self.accessors)  # Missing path
 
-        return self.hash(value)
+    def parse(self, request: RequestView) -> Any:
+        if self.accessors and self._should_stream(request):
+            try:
+                value = request.json_path(self.accessors)
+            except KeyError as e:
+                raise KeyError(f"{self.path!r} not in json content") from e
+            except IndexError as e:
+                raise IndexError(f"{self.path!r} not in json content") from e
+            if value is not jsonpath.UNSUPPORTED:
+                return value
+
+        json = request.json
+        if json is INVALID_JSON:
+            return INVALID_JSON
+
+        value = json
+        for key in self.accessors:
+            try:
+                value = value[key]
+            except KeyError as e:
+                raise KeyError(f"{self.path!r} not in {json!r}") from e
+            except IndexError as e:
+                raise IndexError(f"{self.path!r} not in {json!r}") from e
+
+        return value
+
+    def _should_stream(self, request: RequestView) -> bool:
+        return (
+            self.stream_threshold is not None
+            and "json" not in vars(request)  # Already decoded
+            and len(request.content) >= self.stream_threshold
+        )
 
     def hash(self, value: Union[str, List, Dict]) -> str:
         return jsonlib.dumps(value, sort_keys=True)
 
+    def _eq(self, value: Any) -> Match:
+        equal = json_equal if self.strict else operator.eq
+        return TRUE if equal(value, self.expected) else FALSE
+
+    def _compile_eq(self) -> Lookuper:
+        expected = self.expected
+        equal = json_equal if self.strict else operator.eq
+
+        def eq(value: Any) -> Optional[Mapping[str, Any]]:
+            return NO_CONTEXT if equal(value, expected) else None
+
+        return eq
+
+
+def has_numbers(value: Any) -> bool:
+    """
+    Returns True if given decoded json value contains any numbers or booleans.
+    """
+    if isinstance(value, dict):
+        return any(has_numbers(item) for item in value.values())
+    if isinstance(value, list):
+        return any(has_numbers(item) for item in value)
+    return isinstance(value, (int, float))
+
+
+def json_equal(left: Any, right: Any) -> bool:
+    """
+    Structurally compares decoded json values, with the same semantics as
+    comparing their canonical serializations, i.e. `1`, `1.0` and `true` differ.
+    """
+    if type(left) is not type(right):
+        return False
+    if isinstance(left, dict):
+        return len(left) == len(right) and all(
+            key in right and json_equal(item, right[key]) for key, item in left.items()
+        )
+    if isinstance(left, list):
+        return len(left) == len(right) and all(
+            json_equal(a, b) for a, b in zip(left, right)
+        )
+    if isinstance(left, float) and left != left:
+        return right != right  # NaN
+    return left == right
+
 
 class Data(ContentMixin, Pattern):
+    __slots__ = ()
+
     lookups = (Lookup.EQUAL,)
     key = "data"
     value: bytes
@@ -526,6 +1059,39 @@ def get_scheme_port(scheme: Optional[str]) -> Optional[int]:
     return {"http": 80, "https": 443}.get(scheme)
 
 
+def ensure_path(url: httpx.URL) -> httpx.URL:
+    if not url._uri_reference.path:
+        url = url.copy_with(path="/")
+    return url
+
+
+def parse_cookie_header(header: Optional[str]) -> FrozenSet[Tuple[str, str]]:
+    """
+    Parses a request Cookie header into (name, value) items.
+
+    Plain `name=value` pairs are split directly, while headers with quoted
+    values, cookie attributes or other unusual syntax are left to `SimpleCookie`.
+    """
+    if not header:
+        return EMPTY_COOKIES
+
+    cookies: Dict[str, str] = {}
+    for item in header.split(";"):
+        item = item.strip()
+        if not COOKIE_ITEM_REGEX.fullmatch(item):
+            break
+        name, __, value = item.partition("=")
+        if name.lower() in COOKIE_ATTRIBUTES:
+            break
+        cookies[name] = value
+    else:
+        return frozenset(cookies.items())
+
+    simple_cookie: SimpleCookie = SimpleCookie()
+    simple_cookie.load(rawdata=header)
+    return frozenset((cookie.key, cookie.value) for cookie in simple_cookie.values())
+
+
 def combine(
     patterns: Sequence[Pattern], op: Callable = operator.and_
 ) -> Optional[Pattern]:
@@ -535,6 +1101,60 @@ def combine(
     return reduce(op, patterns)
 
 
+def cost_order(operands: Sequence[Pattern]) -> List[int]:
+    """
+    Returns indices of given operands, ordered by estimated cost, cheapest first.
+
+    Operands are never moved across ones that may raise, so that an error
+    is raised, or short-circuited, the same as when evaluated in operand order.
+    """
+    order: List[int] = []
+    segment: List[int] = []
+    for i, operand in enumerate(operands):
+        if operand.may_raise():
+            order.extend(sorted(segment, key=lambda j: operands[j].estimate_cost()))
+            order.append(i)
+            segment = []
+        else:
+            segment.append(i)
+    order.extend(sorted(segment, key=lambda j: operands[j].estimate_cost()))
+    return order
+
+
+def optimize(pattern: Pattern) -> Pattern:
+    """
+    Optimizes given pattern by flattening nested AND/OR patterns into n-ary ones,
+    dropping duplicate operands and double negations.
+    """
+    if isinstance(pattern, (_And, _Or)):
+        operands: List[Pattern] = []
+        for operand in map(optimize, pattern.value):
+            if type(operand) is type(pattern):
+                operands.extend(operand.value)
+            else:
+                operands.append(operand)
+
+        # Drop duplicates; keep last AND operand to preserve context merge order
+        unique: Dict[Tuple[Pattern, Optional[Pattern]], Pattern] = {}
+        for operand in operands if isinstance(pattern, _Or) else operands[::-1]:
+            unique.setdefault((operand, operand.base), operand)
+        operands = list(unique.values())
+        if isinstance(pattern, _And):
+            operands.reverse()
+
+        if len(operands) == 1:
+            return operands[0]
+        return type(pattern)(tuple(operands))
+
+    if isinstance(pattern, _Invert):
+        operand = optimize(pattern.value)
+        if isinstance(operand, _Invert):
+            return operand.value
+        return _Invert(operand)
+
+    return pattern
+
+
 def parse_url_patterns(
     url: Optional[URLPatternTypes], exact: bool = True
 ) -> Dict[str, Pattern]:
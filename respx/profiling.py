@@ -0,0 +1,158 @@
+import inspect
+from collections import deque
+from time import perf_counter
+from typing import Any, Awaitable, Deque, Dict, NamedTuple, Optional, Tuple
+
+from .models import Route
+from .patterns import RequestView
+from .types import RouteResultTypes
+
+
+class TimingStats(NamedTuple):
+    """
+    Timing stats in seconds, with percentiles of the most recent samples.
+    """
+
+    calls: int  # Number of timed calls
+    total: float
+    p50: float
+    p90: float
+    p99: float
+    max: float
+
+
+class RouteStats(NamedTuple):
+    route: Route
+    name: Optional[str]
+    evaluated: int  # Times route was tried against a request
+    matched: int  # Times route pattern matched
+    declined: int  # Times route side effect resolved as a non-match
+    matching: TimingStats
+    side_effect: TimingStats
+
+
+class Timing:
+    """
+    Accumulated timings, keeping a window of recent samples for percentiles.
+    """
+
+    __slots__ = ("count", "total", "max", "samples")
+
+    max_samples = 1024
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples: Deque[float] = deque(maxlen=self.max_samples)
+
+    def add(self, elapsed: float) -> None:
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+        self.samples.append(elapsed)
+
+    def stats(self) -> TimingStats:
+        samples = sorted(self.samples)
+
+        def percentile(p: int) -> float:
+            if not samples:
+                return 0.0
+            return samples[min(len(samples) - 1, len(samples) * p // 100)]
+
+        return TimingStats(
+            calls=self.count,
+            total=self.total,
+            p50=percentile(50),
+            p90=percentile(90),
+            p99=percentile(99),
+            max=self.max,
+        )
+
+
+class RouteProfile:
+    __slots__ = ("evaluated", "matched", "declined", "matching", "side_effect")
+
+    def __init__(self) -> None:
+        self.evaluated = 0
+        self.matched = 0
+        self.declined = 0
+        self.matching = Timing()
+        self.side_effect = Timing()
+
+    def stats(self, route: Route) -> RouteStats:
+        return RouteStats(
+            route=route,
+            name=route.name,
+            evaluated=self.evaluated,
+            matched=self.matched,
+            declined=self.declined,
+            matching=self.matching.stats(),
+            side_effect=self.side_effect.stats(),
+        )
+
+
+class Profiler:
+    """
+    Per route counters and timings of pattern matching and side effects,
+    recorded when matching routes through the profiler.
+    """
+
+    def __init__(self) -> None:
+        self.profiles: Dict[int, Tuple[Route, RouteProfile]] = {}
+
+    def clear(self) -> None:
+        self.profiles.clear()
+
+    def get(self, route: Route) -> RouteProfile:
+        entry = self.profiles.get(id(route))
+        if entry is None or entry[0] is not route:
+            entry = self.profiles[id(route)] = (route, RouteProfile())
+        return entry[1]
+
+    def stats(self, route: Route) -> RouteStats:
+        return self.get(route).stats(route)
+
+    def match(self, route: Route, view: RequestView) -> RouteResultTypes:
+        """
+        Matches route like `Route.match`, while recording its profile.
+        """
+        profile = self.get(route)
+        profile.evaluated += 1
+
+        started = perf_counter()
+        context = route._match_pattern(view)
+        profile.matching.add(perf_counter() - started)
+        if context is None:
+            return None
+
+        profile.matched += 1
+        if not route.side_effect:
+            return route._resolve_match(view.request, context)
+
+        started = perf_counter()
+        try:
+            result = route._resolve_match(view.request, context)
+        except BaseException:
+            profile.side_effect.add(perf_counter() - started)
+            raise
+
+        if inspect.isawaitable(result):
+            return self._await_side_effect(profile, result, started)
+
+        profile.side_effect.add(perf_counter() - started)
+        if result is None:
+            profile.declined += 1
+        return result
+
+    async def _await_side_effect(
+        self, profile: RouteProfile, result: Awaitable[Any], started: float
+    ) -> Any:
+        try:
+            result = await result
+        finally:
+            profile.side_effect.add(perf_counter() - started)
+        if result is None:
+            profile.declined += 1
+        return result
@@ -1,4 +1,6 @@
 import inspect
+import time
+from collections import OrderedDict
 from contextlib import contextmanager
 from functools import update_wrapper
 from types import TracebackType
@@ -6,6 +8,7 @@ from typing import (
     Any,
     Callable,
     Dict,
+    Hashable,
     List,
     NewType,
     Optional,
@@ -17,20 +20,84 @@ from typing import (
 
 import httpx
 
+from .latency import Bandwidth, Latency, asleep, sleep
 from .mocks import Mocker
 from .models import (
+    Call,
     CallList,
     PassThrough,
+    Recording,
     ResolvedRoute,
     Route,
     RouteList,
     SideEffectError,
 )
-from .patterns import Pattern, merge_patterns, parse_url_patterns
+from .patterns import Pattern, RequestView, merge_patterns, parse_url_patterns
+from .profiling import Profiler, RouteStats
 from .types import DefaultType, RouteResultTypes, URLPatternTypes
 
 Default = NewType("Default", object)
 DEFAULT = Default(...)
+MISS = object()
+
+
+class ResolutionCache:
+    """
+    LRU cache of resolved routes, or None for no match, by request fingerprint.
+
+    The fingerprint only holds the request facets read by the routes' patterns,
+    and the cache is cleared on any change of routes, their patterns or results.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.entries: "OrderedDict[Hashable, Optional[Route]]" = OrderedDict()
+        self.facets: Optional[Tuple[str, ...]] = None
+        self.revision: Optional[Tuple[int, int]] = None
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.revision = None
+
+    def fingerprint(
+        self, request: RequestView, routes: RouteList
+    ) -> Optional[Hashable]:
+        """
+        Returns request fingerprint, or None if routes are not cacheable.
+        """
+        revision = (routes.revision, routes.result_revision)
+        if revision != self.revision:
+            self.clear()
+            self.revision = revision
+            self.facets = self.get_facets(routes)
+
+        if self.facets is None:
+            return None
+
+        return request.fingerprint(self.facets)
+
+    def get_facets(self, routes: RouteList) -> Optional[Tuple[str, ...]]:
+        facets: Dict[str, None] = {}
+        for route in routes:
+            for pattern in route.pattern or ():
+                for _pattern in (pattern, pattern.base):
+                    if _pattern is None:
+                        continue
+                    if _pattern.facet is None:
+                        return None  # Custom pattern, not cacheable
+                    facets[_pattern.facet] = None
+        return tuple(facets)
+
+    def get(self, fingerprint: Hashable) -> Any:
+        route = self.entries.get(fingerprint, MISS)
+        if route is not MISS:
+            self.entries.move_to_end(fingerprint)
+        return route
+
+    def set(self, fingerprint: Hashable, route: Optional[Route]) -> None:
+        self.entries[fingerprint] = route
+        if len(self.entries) > self.size:
+            self.entries.popitem(last=False)
 
 
 class Router:
@@ -40,13 +107,23 @@ class Router:
         assert_all_called: bool = True,
         assert_all_mocked: bool = True,
         base_url: Optional[str] = None,
+        cache_size: int = 0,
+        profile: bool = False,
+        latency: Optional[Union[Latency, float]] = None,
+        bandwidth: Optional[Union[Bandwidth, float]] = None,
+        recording: Union[bool, Recording] = True,
     ) -> None:
         self._assert_all_called = assert_all_called
         self._assert_all_mocked = assert_all_mocked
         self._bases = parse_url_patterns(base_url, exact=False)
+        self._cache = ResolutionCache(cache_size) if cache_size else None
+        self._profiler = Profiler() if profile else None
+        self.latency = Latency.of(latency)
+        self.bandwidth = Bandwidth.of(bandwidth)
+        self._recording = Recording.of(recording)
 
         self.routes = RouteList()
-        self.calls = CallList()
+        self.calls = CallList(recording=self._recording)
 
         self._snapshots: List[Tuple] = []
         self.snapshot()
@@ -61,6 +138,9 @@ class Router:
         """
         Snapshots current routes and calls state.
         """
+        if self._cache:
+            self._cache.clear()
+
         # Snapshot current routes and calls
         routes = RouteList(self.routes)
         calls = CallList(self.calls)
@@ -77,10 +157,13 @@ class Router:
         if not self._snapshots:
             return
 
+        if self._cache:
+            self._cache.clear()
+
         # Revert added routes and calls to last snapshot
         routes, calls = self._snapshots.pop()
         self.routes[:] = routes
-        self.calls[:] = calls
+        self.calls.restore(calls)
 
         # Revert each route state to last snapshot
         for route in self.routes:
@@ -88,11 +171,23 @@ class Router:
 
     def reset(self) -> None:
         """
-        Resets call stats.
+        Resets call stats, and any profiling stats.
         """
         self.calls.clear()
         for route in self.routes:
             route.reset()
+        if self._profiler:
+            self._profiler.clear()
+
+    def stats(self) -> List[RouteStats]:
+        """
+        Returns profiling stats of each route, in route order.
+
+        Stats are only recorded by routers created with `profile=True`.
+        """
+        if self._profiler is None:
+            return []
+        return [self._profiler.stats(route) for route in self.routes]
 
     def assert_all_called(self) -> None:
         assert all(
@@ -141,6 +236,7 @@ class Router:
 
         route._pattern = merge_patterns(route.pattern, **self._bases)
         route = self.routes.add(route, name=name)
+        route.compile()
         return route
 
     def request(
@@ -222,10 +318,28 @@ class Router:
         *,
         response: Optional[httpx.Response] = None,
         route: Optional[Route] = None,
+        latency: Optional[float] = None,
+        error: Optional[BaseException] = None,
     ) -> None:
-        call = self.calls.record(request, response)
+        timestamp = time.time()
+        self.calls.stats.update(request, response, error, timestamp)
         if route:
-            route.calls.append(call)
+            route.calls.stats.update(request, response, error, timestamp)
+
+        recording = self._recording
+        if recording and not recording.enabled:
+            # Only count calls, e.g. for long running load tests
+            self.calls.skip()
+            if route:
+                route.calls.skip()
+            return
+
+        # Sample once per request, keeping the same calls on router and route
+        call = Call(request=request, response=response)
+        sampled = recording is None or recording.keep(call, self.calls.call_count + 1)
+        self.calls.add(call, recording, latency, sampled=sampled)
+        if route:
+            route.calls.add(call, recording, latency, sampled=sampled)
 
     @contextmanager
     def resolver(self, request):
@@ -254,29 +368,154 @@ class Router:
                 assert isinstance(resolved.response, httpx.Response)
 
         except SideEffectError as error:
-            self.record(request, response=None, route=error.route)
+            self.record(request, response=None, route=error.route, error=error.origin)
             raise error.origin from error
         except PassThrough:
             self.record(request, response=None, route=resolved.route)
             raise
         else:
-            self.record(request, response=resolved.response, route=resolved.route)
+            self.record(
+                request,
+                response=resolved.response,
+                route=resolved.route,
+                latency=resolved.latency,
+            )
+
+    def lookup(self, request: httpx.Request) -> Optional[List[Route]]:
+        """
+        Returns candidate routes of given request, looked up ahead of resolving
+        it when its body may be left unread, i.e. when calls are not recorded,
+        and routes are not resolved by cache, else None.
+        """
+        recording = self._recording
+        if recording is None or recording.enabled or self._cache:
+            return None
+        return self.routes.candidates(request)
+
+    def reads_content(
+        self, request: httpx.Request, routes: Optional[List[Route]] = None
+    ) -> bool:
+        """
+        Returns True if the body of given request should be read before resolving
+        it, i.e. when calls are recorded, or when any of given candidate routes,
+        or any route when fingerprinted for the cache, may read it.
+        """
+        recording = self._recording
+        if recording is None or recording.enabled:
+            return True  # Recorded calls keep the request content
+        if routes is None and self._cache:
+            return any(route._reads_content() for route in self.routes)
+        if routes is None:
+            routes = self.routes.candidates(request)
+        return any(route._reads_content() for route in routes)
+
+    def _lookup(
+        self, request: RequestView, routes: Optional[List[Route]] = None
+    ) -> Tuple[List[Route], Optional[Hashable]]:
+        """
+        Returns routes to try in order for given request, either given candidates,
+        a cached route or all candidates, and the request fingerprint to cache the
+        result by.
+        """
+        if routes is not None:
+            return routes, None
+
+        cache = self._cache
+        if cache is None:
+            return self.routes.candidates(request), None
+
+        fingerprint = cache.fingerprint(request, self.routes)
+        if fingerprint is None:
+            return self.routes.candidates(request), None
+
+        route = cache.get(fingerprint)
+        if route is MISS:
+            return self.routes.candidates(request), fingerprint
+
+        return ([route] if route else []), None
+
+    def _cache_resolved(
+        self,
+        fingerprint: Optional[Hashable],
+        route: Optional[Route],
+        tried: List[Route],
+    ) -> None:
+        """
+        Caches resolved route, or no match, unless any tried route may decline.
+        """
+        if fingerprint is None or any(_route._may_decline() for _route in tried):
+            return
+        if route is None and self._assert_all_mocked:
+            return
+        assert self._cache is not None
+        self._cache.set(fingerprint, route)
+
+    def _sample_latency(
+        self, request: httpx.Request, resolved: ResolvedRoute
+    ) -> Optional[float]:
+        """
+        Samples simulated latency of a resolved mocked response, if any,
+        by the resolved route's latency model, or else the router's.
+        """
+        route = resolved.route
+        if route is None:
+            if self._assert_all_mocked:
+                return None  # Not mocked, and about to fail
+            latency = self.latency
+        elif resolved.response is request:
+            return None  # Pass-through
+        else:
+            latency = route.latency or self.latency
+
+        resolved.latency = latency.sample() if latency else None
+        return resolved.latency
+
+    def _throttle(self, request: httpx.Request, resolved: ResolvedRoute) -> None:
+        """
+        Paces the resolved mocked response stream to the resolved route's
+        bandwidth, or else the router's.
+        """
+        route = resolved.route
+        response = resolved.response
+        if route is None or not isinstance(response, httpx.Response):
+            return
+        bandwidth = route.bandwidth or self.bandwidth
+        if bandwidth:
+            response.stream = bandwidth.throttle(response.stream)
 
-    def resolve(self, request: httpx.Request) -> ResolvedRoute:
+    def resolve(
+        self, request: httpx.Request, routes: Optional[List[Route]] = None
+    ) -> ResolvedRoute:
         with self.resolver(request) as resolved:
-            for route in self.routes:
-                prospect = route.match(request)
+            view = RequestView(request)
+            routes, fingerprint = self._lookup(view, routes)
+            match = self._profiler.match if self._profiler else Route.match
+            for i, route in enumerate(routes):
+                prospect = match(route, view)
                 if prospect is not None:
                     resolved.route = route
                     resolved.response = prospect
+                    routes = routes[: i + 1]
                     break
 
+            self._cache_resolved(fingerprint, resolved.route, routes)
+
+            latency = self._sample_latency(request, resolved)
+            if latency:
+                sleep(latency)
+            self._throttle(request, resolved)
+
         return resolved
 
-    async def aresolve(self, request: httpx.Request) -> ResolvedRoute:
+    async def aresolve(
+        self, request: httpx.Request, routes: Optional[List[Route]] = None
+    ) -> ResolvedRoute:
         with self.resolver(request) as resolved:
-            for route in self.routes:
-                prospect: RouteResultTypes = route.match(request)
+            view = RequestView(request)
+            routes, fingerprint = self._lookup(view, routes)
+            match = self._profiler.match if self._profiler else Route.match
+            for i, route in enumerate(routes):
+                prospect: RouteResultTypes = match(route, view)
 
                 # Await async side effect and wrap any exception
                 if inspect.isawaitable(prospect):
@@ -288,17 +527,29 @@ class Router:
                 if prospect is not None:
                     resolved.route = route
                     resolved.response = prospect
+                    routes = routes[: i + 1]
                     break
 
+            self._cache_resolved(fingerprint, resolved.route, routes)
+
+            latency = self._sample_latency(request, resolved)
+            if latency:
+                await asleep(latency)
+            self._throttle(request, resolved)
+
         return resolved
 
-    def handler(self, request: httpx.Request) -> httpx.Response:
-        resolved = self.resolve(request)
+    def handler(
+        self, request: httpx.Request, routes: Optional[List[Route]] = None
+    ) -> httpx.Response:
+        resolved = self.resolve(request, routes)
         assert isinstance(resolved.response, httpx.Response)
         return resolved.response
 
-    async def async_handler(self, request: httpx.Request) -> httpx.Response:
-        resolved = await self.aresolve(request)
+    async def async_handler(
+        self, request: httpx.Request, routes: Optional[List[Route]] = None
+    ) -> httpx.Response:
+        resolved = await self.aresolve(request, routes)
         assert isinstance(resolved.response, httpx.Response)
         return resolved.response
 
@@ -312,12 +563,22 @@ class MockRouter(Router):
         assert_all_called: bool = True,
         assert_all_mocked: bool = True,
         base_url: Optional[str] = None,
+        cache_size: int = 0,
+        profile: bool = False,
+        latency: Optional[Union[Latency, float]] = None,
+        bandwidth: Optional[Union[Bandwidth, float]] = None,
+        recording: Union[bool, Recording] = True,
         using: Optional[Union[str, Default]] = DEFAULT,
     ) -> None:
         super().__init__(
             assert_all_called=assert_all_called,
             assert_all_mocked=assert_all_mocked,
             base_url=base_url,
+            cache_size=cache_size,
+            profile=profile,
+            latency=latency,
+            bandwidth=bandwidth,
+            recording=recording,
         )
         self._using = using
 
@@ -328,6 +589,11 @@ class MockRouter(Router):
         assert_all_called: Optional[bool] = None,
         assert_all_mocked: Optional[bool] = None,
         base_url: Optional[str] = None,
+        cache_size: int = 0,
+        profile: bool = False,
+        latency: Optional[Union[Latency, float]] = None,
+        bandwidth: Optional[Union[Bandwidth, float]] = None,
+        recording: Union[bool, Recording] = True,
         using: Optional[Union[str, Default]] = DEFAULT,
     ) -> Union["MockRouter", Callable]:
         """
@@ -343,6 +609,11 @@ class MockRouter(Router):
             #   FYI, global ctx `with respx.mock:` hits __enter__ directly
             settings: Dict[str, Any] = {
                 "base_url": base_url,
+                "cache_size": cache_size,
+                "profile": profile,
+                "latency": latency,
+                "bandwidth": bandwidth,
+                "recording": recording,
                 "using": using,
             }
             if assert_all_called is not None:
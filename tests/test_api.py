@@ -2,6 +2,7 @@ import asyncio
 import json as jsonlib
 import re
 import socket
+import time
 from unittest import mock
 
 import httpcore
@@ -9,6 +10,7 @@ import httpx
 import pytest
 
 import respx
+from respx.latency import Bandwidth
 from respx.models import Route
 from respx.patterns import M
 from respx.router import MockRouter
@@ -557,6 +559,45 @@ def test_respond():
             route.respond(content=Exception())
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize("using", ["httpcore", "httpx"])
+@pytest.mark.parametrize("buffer", [False, True])
+async def test_streaming_response(using, buffer):
+    streamed = []
+
+    def stream():
+        for chunk in (b"foo", b"bar"):
+            streamed.append(chunk)
+            yield chunk
+
+    async def astream():
+        for chunk in stream():
+            yield chunk
+
+    async with MockRouter(using=using) as respx_mock:
+        route = respx_mock.get("https://foo.bar/").respond(
+            content=stream(), buffer=buffer
+        )
+        with httpx.stream("GET", "https://foo.bar/") as response:
+            chunks = response.iter_raw()
+            assert next(chunks) == b"foo"
+            assert streamed == [b"foo"]  # Not eagerly read
+            assert b"".join(chunks) == b"bar"
+
+        route.respond(content=astream(), buffer=buffer)
+        async with httpx.AsyncClient() as client:
+            response = await client.get("https://foo.bar/")
+            assert response.content == b"foobar"
+
+        assert route.call_count == 2
+        for call in route.calls:
+            if buffer:
+                assert call.response.content == b"foobar"
+            else:
+                with pytest.raises(httpx.ResponseNotRead):
+                    call.response.content
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
     "kwargs",
@@ -574,3 +615,246 @@ async def test_async_post_content(kwargs):
         async with httpx.AsyncClient() as client:
             response = await client.post("https://foo.bar/", **kwargs)
             assert response.status_code == 201
+
+
+@pytest.mark.parametrize(
+    "headers,expected_status,expected_content,expected_range",
+    [
+        ({}, 200, b"0123456789", None),
+        ({"Range": "bytes=2-5"}, 206, b"2345", "bytes 2-5/10"),
+        ({"Range": "bytes=7-"}, 206, b"789", "bytes 7-9/10"),
+        ({"Range": "bytes=8-20"}, 206, b"89", "bytes 8-9/10"),
+        ({"Range": "bytes=-3"}, 206, b"789", "bytes 7-9/10"),
+        ({"Range": "bytes=-30"}, 206, b"0123456789", "bytes 0-9/10"),
+        ({"Range": "bytes=10-"}, 416, b"", "bytes */10"),
+        ({"Range": "bytes=-0"}, 416, b"", "bytes */10"),
+        ({"Range": "bytes=5-2"}, 200, b"0123456789", None),
+        ({"Range": "bytes=0-1,4-5"}, 200, b"0123456789", None),
+        ({"Range": "bytes=-"}, 200, b"0123456789", None),
+        ({"Range": "lines=0-1"}, 200, b"0123456789", None),
+        ({"Range": "bytes=2-3", "If-Range": '"foo"'}, 200, b"0123456789", None),
+    ],
+)
+def test_respond_file(
+    tmp_path, headers, expected_status, expected_content, expected_range
+):
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"0123456789")
+
+    with respx.mock:
+        route = respx.get("https://foo.bar/").respond(file=path)
+        handler = route.side_effect
+        handler.chunk_size = 3
+
+        with httpx.stream("GET", "https://foo.bar/", headers=headers) as response:
+            chunks = list(response.iter_raw())
+            assert response.status_code == expected_status
+            assert b"".join(chunks) == expected_content
+            assert all(len(chunk) <= 3 for chunk in chunks)
+            assert response.headers["Content-Length"] == str(len(expected_content))
+            assert response.headers["Content-Type"] == "application/octet-stream"
+            assert response.headers.get("Content-Range") == expected_range
+            assert response.headers["Accept-Ranges"] == "bytes"
+
+        handler.close()
+
+
+@pytest.mark.asyncio
+async def test_respond_file__resume(tmp_path):
+    path = tmp_path / "data.txt"
+    path.write_bytes(b"foobar")
+
+    async with respx.mock:
+        route = respx.route(url="https://foo.bar/").respond(
+            201, file=str(path), headers={"X-Foo": "bar"}
+        )
+        async with httpx.AsyncClient() as client:
+            response = await client.get("https://foo.bar/")
+            assert response.status_code == 201
+            assert response.content == b"foobar"
+            assert response.headers["Content-Type"] == "text/plain"
+            assert response.headers["X-Foo"] == "bar"
+
+            # Ranges are only served for OK responses
+            route.respond(file=path)
+            response = await client.get("https://foo.bar/")
+            etag = response.headers["ETag"]
+            last_modified = response.headers["Last-Modified"]
+
+            for validator in (etag, last_modified):
+                response = await client.get(
+                    "https://foo.bar/",
+                    headers={"Range": "bytes=3-", "If-Range": validator},
+                )
+                assert response.status_code == 206
+                assert response.content == b"bar"
+
+            response = await client.head("https://foo.bar/")
+            assert response.headers["Content-Length"] == "6"
+            assert response.content == b""
+
+    empty = tmp_path / "empty.txt"
+    empty.write_bytes(b"")
+    handler = respx.FileHandler(empty)
+    response = handler(httpx.Request("GET", "https://foo.bar/"))
+    assert response.read() == b""
+    response = handler(
+        httpx.Request("GET", "https://foo.bar/", headers={"Range": "bytes=0-"})
+    )
+    assert response.status_code == 416
+    handler.close()
+
+    with pytest.raises(TypeError, match="both a file and content"):
+        Route().respond(file=path, content="foobar")
+    for kwargs in (
+        {"encodings": ["gzip"]},
+        {"http_version": "HTTP/2"},
+        {"buffer": True},
+        {"extensions": {}},
+    ):
+        with pytest.raises(TypeError, match="a file and encodings"):
+            Route().respond(file=path, **kwargs)
+
+
+def test_respond_file__release(tmp_path):
+    path = tmp_path / "data.txt"
+    path.write_bytes(b"foobar")
+    request = httpx.Request("GET", "https://foo.bar/")
+
+    # Replaced file is unmapped
+    route = Route().respond(file=path)
+    handler = route.side_effect
+    assert handler(request).read() == b"foobar"
+    route.respond(file=path)
+    assert handler._data is None
+
+    # Rolled back file is unmapped, and the snapshot's re-mapped on demand
+    route.snapshot()
+    snapshot_handler = route.side_effect
+    route.respond(file=path)
+    handler = route.side_effect
+    assert handler(request).read() == b"foobar"
+    route.rollback()
+    assert handler._data is None
+    assert route.side_effect is snapshot_handler
+    assert route.side_effect(request).read() == b"foobar"
+
+    # Reset file is unmapped
+    route.reset()
+    assert route.side_effect._data is None
+
+
+@pytest.mark.parametrize("using", ["httpcore", "httpx"])
+@pytest.mark.parametrize(
+    "accept_encoding,expected_encoding",
+    [
+        (None, None),
+        ("", None),
+        ("gzip", "gzip"),
+        ("deflate", "deflate"),
+        ("gzip, deflate", "gzip"),
+        ("deflate;q=1.0, gzip;q=0.5", "deflate"),
+        ("GZIP;q=0.5, identity;q=0.1", "gzip"),
+        ("gzip;foo=bar;q=0.5", None),
+        ("gzip;q=0, deflate;q=0", None),
+        ("gzip;q=foo, *;q=0.5", "deflate"),
+        ("br, , identity", None),
+        ("*", "gzip"),
+        ("*;q=0, identity", None),
+        ("identity;q=0, deflate", "deflate"),
+    ],
+)
+def test_respond_encodings(using, accept_encoding, expected_encoding):
+    with respx.mock(using=using) as respx_mock:
+        route = respx_mock.get("https://foo.bar/").respond(
+            json={"foo": "bar"}, encodings=["gzip", "deflate"]
+        )
+
+        headers = {"Accept-Encoding": accept_encoding} if accept_encoding else {}
+        request = httpx.Request("GET", "https://foo.bar/", headers=headers)
+        with httpx.Client() as client:
+            response = client.send(request)
+
+        assert response.json() == {"foo": "bar"}
+        assert response.headers.get("Content-Encoding") == expected_encoding
+        assert response.headers["Vary"] == "Accept-Encoding"
+        assert response.headers["Content-Type"] == "application/json"
+        assert int(response.headers["Content-Length"]) == response.num_bytes_downloaded
+        assert route.calls.last.response.json() == {"foo": "bar"}
+
+
+@pytest.mark.parametrize(
+    "accept_encoding", ["identity;q=0", "*;q=0", "br, *;q=0", "gzip;q=0, *;q=0"]
+)
+def test_respond_encodings__not_acceptable(accept_encoding):
+    route = Route().respond(json={"foo": "bar"}, encodings=["gzip", "deflate"])
+    request = httpx.Request(
+        "GET", "https://foo.bar/", headers={"Accept-Encoding": accept_encoding}
+    )
+    response = route.match(request)
+    assert response.status_code == 406
+    assert response.content == b""
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert "Content-Encoding" not in response.headers
+
+
+def test_respond_encodings__negotiated():
+    route = Route().respond(text="foo" * 100, encodings=["deflate", "gzip"])
+    variants = route.side_effect
+    variants.max_negotiated = 2
+
+    for accept_encoding in ("gzip", "deflate", "gzip", "br"):
+        request = httpx.Request(
+            "GET", "https://foo.bar/", headers={"Accept-Encoding": accept_encoding}
+        )
+        response = route.match(request)
+        assert response.text == "foo" * 100
+        assert len(variants.negotiated) <= 2
+
+    with pytest.raises(ValueError, match="Unsupported content encoding 'zstd'"):
+        Route().respond(text="foo", encodings=["zstd"])
+
+    with pytest.raises(TypeError, match="Only static response content"):
+        Route().respond(content=iter([b"foo"]), encodings=["gzip"])
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("using", ["httpcore", "httpx"])
+async def test_bandwidth(using):
+    async with MockRouter(using=using, bandwidth=Bandwidth(1000, burst=100)) as router:
+        route = router.get("https://foo.bar/").respond(content=b"x" * 500)
+
+        clock = [0.0]
+
+        def fake_sleep(seconds):
+            clock[0] += seconds
+
+        with mock.patch("time.sleep", side_effect=fake_sleep) as sleep:
+            with mock.patch("time.monotonic", side_effect=lambda: clock[0]):
+                with httpx.stream("GET", "https://foo.bar/") as response:
+                    chunks = list(response.iter_raw())
+
+        # Burst is sent at once, and the rest paced in burst sized chunks
+        assert [len(chunk) for chunk in chunks] == [100] * 5
+        assert sleep.call_count == 4
+        delays = [call.args[0] for call in sleep.call_args_list]
+        assert delays == [pytest.approx(0.1)] * 4
+        assert clock[0] == pytest.approx(0.4)
+
+        route.bandwidth = Bandwidth(10000, burst=100)
+        async with httpx.AsyncClient() as client:
+            started = time.monotonic()
+            response = await client.get("https://foo.bar/")
+            assert time.monotonic() - started >= 0.035
+            assert response.content == b"x" * 500
+
+        assert route.call_count == 2
+        assert route.calls.last.response.content == b"x" * 500
+
+    route.bandwidth = 1000000
+    assert route.bandwidth.chunk_size == 100000
+    assert list(route.bandwidth.throttle(httpx.ByteStream(b"foo"))) == [b"foo"]
+    with pytest.raises(ValueError, match="must be positive"):
+        Bandwidth(0)
+    with pytest.raises(TypeError, match="Bandwidth must be"):
+        Route().bandwidth = "fast"
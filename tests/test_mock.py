@@ -1,4 +1,6 @@
+import socket
 from contextlib import ExitStack as does_not_raise, contextmanager
+from unittest import mock
 
 import httpcore
 import httpx
@@ -6,7 +8,7 @@ import pytest
 
 import respx
 from respx import ASGIHandler, WSGIHandler
-from respx.mocks import Mocker
+from respx.mocks import HTTPCoreMocker, Mocker
 from respx.router import MockRouter
 
 # from respx.transports import MockTransport
@@ -770,6 +772,117 @@ async def test_httpcore_request(url, port):
             assert body == b"foobar"
 
 
+@pytest.mark.asyncio
+async def test_httpcore_request__template():
+    async with MockRouter(using="httpcore") as router:
+        route = router.get("https://foo.bar/").respond(201, json={"foo": "bar"})
+        expected_headers = [
+            (b"Content-Length", b"14"),
+            (b"Content-Type", b"application/json"),
+        ]
+
+        with httpcore.SyncConnectionPool() as http:
+            (status_code, headers, stream, ext) = http.handle_request(
+                method=b"GET", url=(b"https", b"foo.bar", None, b"/")
+            )
+
+            assert status_code == 201
+            assert headers == expected_headers
+            assert b"".join([chunk for chunk in stream]) == b'{"foo": "bar"}'
+
+        async with httpcore.AsyncConnectionPool() as http:
+            (status_code, _headers, stream, ext) = await http.handle_async_request(
+                method=b"GET", url=(b"https", b"foo.bar", None, b"/")
+            )
+
+            # Pre-encoded headers are shared between calls
+            assert _headers is headers
+            assert b"".join([chunk async for chunk in stream]) == b'{"foo": "bar"}'
+
+        assert route.call_count == 2
+        assert route.calls.last.response.headers.raw == expected_headers
+
+
+@pytest.mark.asyncio
+async def test_httpcore_request__lazy_content():
+    consumed = []
+
+    def upload():
+        consumed.append(True)
+        yield b"foo"
+        yield b"bar"
+
+    async def aupload():
+        for chunk in upload():
+            yield chunk
+
+    url = (b"https", b"foo.bar", None, b"/")
+
+    # Body read by default, kept by recorded calls
+    async with MockRouter(using="httpcore") as router:
+        route = router.post("https://foo.bar/") % 201
+        with httpcore.SyncConnectionPool() as http:
+            stream = httpcore.IteratorByteStream(upload())
+            (status_code, *_) = http.handle_request(b"POST", url, stream=stream)
+            assert status_code == 201
+            assert route.calls.last.request.content == b"foobar"
+            assert consumed
+            consumed.clear()
+
+    # Opted out of by not recording calls, by all registered routers
+    async with MockRouter(using="httpcore", recording=False) as router:
+        routers = mock.patch.object(HTTPCoreMocker, "routers", [router])
+        routers.start()
+        route = router.post("https://foo.bar/") % 201
+        router.post("https://ham.spam/", content=b"foobar") % 202
+        pass_route = router.post(host="pass.through").pass_through()
+        candidates = mock.patch.object(
+            router.routes, "candidates", wraps=router.routes.candidates
+        )
+
+        # Body not read when not matched by any candidate route
+        with httpcore.SyncConnectionPool() as http, candidates as lookup:
+            stream = httpcore.IteratorByteStream(upload())
+            (status_code, *_) = http.handle_request(b"POST", url, stream=stream)
+            assert status_code == 201
+            assert not consumed
+            assert lookup.call_count == 1  # Looked up once, ahead of resolving
+
+        async with httpcore.AsyncConnectionPool() as http:
+            stream = httpcore.AsyncIteratorByteStream(aupload())
+            (status_code, *_) = await http.handle_async_request(
+                b"POST", url, stream=stream
+            )
+            assert status_code == 201
+            assert not consumed
+
+            # Body read when matched by content
+            stream = httpcore.AsyncIteratorByteStream(aupload())
+            (status_code, *_) = await http.handle_async_request(
+                b"POST", (b"https", b"ham.spam", None, b"/"), stream=stream
+            )
+            assert status_code == 202
+            assert consumed
+            consumed.clear()
+
+        # Original stream passed through unread
+        with mock.patch(
+            "socket.create_connection", side_effect=socket.error("blocked")
+        ):
+            with httpcore.SyncConnectionPool() as http:
+                with pytest.raises(httpcore.ConnectError):
+                    http.handle_request(
+                        b"POST",
+                        (b"http", b"pass.through", None, b"/"),
+                        headers=[(b"Host", b"pass.through")],
+                        stream=httpcore.IteratorByteStream(upload()),
+                        extensions={},
+                    )
+                assert pass_route.called
+                assert not consumed
+        routers.stop()
+
+
 @pytest.mark.asyncio
 async def test_route_rollback():
     respx_mock = respx.mock()
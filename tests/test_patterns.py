@@ -1,10 +1,14 @@
+import random
 import re
+from http.cookies import CookieError, SimpleCookie
 
 import httpx
 import pytest
 
 from respx.patterns import (
+    FALSE,
     JSON,
+    TRUE,
     URL,
     Content,
     Cookies,
@@ -13,13 +17,18 @@ from respx.patterns import (
     Host,
     Lookup,
     M,
+    Match,
     Method,
     Params,
     Path,
     Pattern,
     Port,
+    RequestView,
     Scheme,
+    cost_order,
     merge_patterns,
+    optimize,
+    parse_cookie_header,
     parse_url_patterns,
 )
 
@@ -63,6 +72,22 @@ def test_match_context():
     match = pattern.match(request)
     assert bool(match)
     assert match.context == {"host": "foo.bar", "slug": "baz"}
+    assert not ~match
+    assert (~match).context == match.context
+
+
+def test_match_singletons():
+    request = httpx.Request("GET", "https://foo.bar/")
+    match = Method("GET").match(request)
+    assert match is TRUE
+    assert ~match is FALSE
+    assert Method("POST").match(request) is FALSE
+    assert (Method("GET") & Host("foo.bar")).match(request) is TRUE
+
+    with pytest.raises(AttributeError):
+        match.matches = False
+    with pytest.raises(AttributeError):
+        match.foo = "bar"
 
 
 @pytest.mark.parametrize(
@@ -85,13 +110,35 @@ def test_method_pattern(lookup, value, expected):
     [
         (Lookup.CONTAINS, {"X-Foo": "bar"}, {"x-foo": "bar"}, True),
         (Lookup.CONTAINS, {"content-type": "text/plain"}, "", False),
+        (Lookup.CONTAINS, {"X-Foo": "bar"}, {"x-foo": "BAR"}, False),
+        (
+            Lookup.CONTAINS,
+            [("X-Foo", "bar"), ("x-foo", "baz")],
+            [("x-foo", "baz"), ("X-Ham", "spam"), ("x-FOO", "bar")],
+            True,
+        ),
+        (Lookup.CONTAINS, [("x-foo", "bar")] * 2, {"x-foo": "bar"}, False),
+        (
+            Lookup.EQUAL,
+            {
+                "Host": "foo.bar",
+                "X-Foo": "bar",
+                "Content-Type": "application/json",
+                "Content-Length": "14",
+            },
+            {"x-foo": "bar"},
+            True,
+        ),
+        (Lookup.EQUAL, {"x-foo": "bar"}, {"x-foo": "bar"}, False),
     ],
 )
 def test_headers_pattern(lookup, headers, request_headers, expected):
     request = httpx.Request(
         "GET", "http://foo.bar/", headers=request_headers, json={"foo": "bar"}
     )
-    assert bool(Headers(headers, lookup=lookup).match(request)) is expected
+    pattern = Headers(headers, lookup=lookup)
+    assert bool(pattern.match(request)) is expected
+    assert (pattern.compile()(RequestView(request)) is not None) is expected
 
 
 @pytest.mark.parametrize(
@@ -110,13 +157,67 @@ def test_cookies_pattern(lookup, cookies, request_cookies, expected):
     request = httpx.Request(
         "GET", "http://foo.bar/", cookies=request_cookies, json={"foo": "bar"}
     )
-    assert bool(Cookies(cookies, lookup=lookup).match(request)) is expected
+    pattern = Cookies(cookies, lookup=lookup)
+    assert bool(pattern.match(request)) is expected
+    assert (pattern.compile()(RequestView(request)) is not None) is expected
 
 
 def test_cookies_pattern__hash():
     assert Cookies({"x": "1", "y": "2"}) == Cookies({"y": "2", "x": "1"})
 
 
+@pytest.mark.parametrize(
+    "header",
+    [
+        None,
+        "",
+        "foo=bar",
+        "foo=bar; ham=spam",
+        "foo=bar;ham=spam;",
+        "session=YWJj==; next=/foo/bar",
+        "foo=1; foo=2",
+        "foo=",
+        'foo="b\\"ar"; ham=spam',
+        "foo=bar; Path=/",
+        "$Version=1; foo=bar",
+        "foo=bar;; ham=spam",
+        "foo bar=baz; ham=spam",
+        "é==</:0>%~y$>",
+        "&=é<",
+        "ñam=spam; foo=bar",
+    ],
+)
+def test_parse_cookie_header(header):
+    expected = set()
+    if header:
+        cookies = SimpleCookie()
+        cookies.load(header)
+        expected = {(cookie.key, cookie.value) for cookie in cookies.values()}
+    assert parse_cookie_header(header) == expected
+
+
+def test_parse_cookie_header__parity():
+    def simple_cookie_items(header):
+        cookies = SimpleCookie()
+        try:
+            cookies.load(header)
+        except CookieError:
+            return CookieError
+        return {(cookie.key, cookie.value) for cookie in cookies.values()}
+
+    def cookie_items(header):
+        try:
+            return parse_cookie_header(header)
+        except CookieError:
+            return CookieError
+
+    rnd = random.Random(0)
+    alphabet = "ab0=; \t$<>/:%~&\"',[]\\\x7f{}()?@^|`*+-.!#éñ"
+    for _ in range(20000):
+        header = "".join(rnd.choices(alphabet, k=rnd.randint(1, 14)))
+        assert cookie_items(header) == simple_cookie_items(header), header
+
+
 @pytest.mark.parametrize(
     "lookup,scheme,expected",
     [
@@ -194,15 +295,27 @@ def test_path_pattern():
         (Lookup.CONTAINS, "x=1", "https://foo.bar/?x=1", True),
         (Lookup.CONTAINS, "y=2", "https://foo.bar/?x=1", False),
         (Lookup.CONTAINS, "x=1&y=2", "https://foo.bar/?x=1", False),
+        (Lookup.CONTAINS, "x=1&x=1", "https://foo.bar/?x=1&y=2", False),
+        (Lookup.CONTAINS, "x=1&x=1", "https://foo.bar/?x=1&y=2&x=1", True),
+        (Lookup.CONTAINS, "X=1", "https://foo.bar/?x=1", False),
         (Lookup.EQUAL, "", "https://foo.bar/", True),
         (Lookup.EQUAL, "x=1", "https://foo.bar/?x=1", True),
         (Lookup.EQUAL, "y=2", "https://foo.bar/?x=1", False),
         (Lookup.EQUAL, "x=1&y=2", "https://foo.bar/?x=1", False),
+        (Lookup.EQUAL, "y=2&x=1", "https://foo.bar/?x=1&y=2", True),
+        (Lookup.EQUAL, "x=1&x=1", "https://foo.bar/?x=1", False),
     ],
 )
 def test_params_pattern(lookup, params, url, expected):
     request = httpx.Request("GET", url)
-    assert bool(Params(params, lookup=lookup).match(request)) is expected
+    pattern = Params(params, lookup=lookup)
+    assert bool(pattern.match(request)) is expected
+    assert (pattern.compile()(RequestView(request)) is not None) is expected
+
+
+def test_params_pattern__hash():
+    assert Params("x=1&y=2") == Params("y=2&x=1")
+    assert Params("x=1") != Params("x=1&x=1")
 
 
 @pytest.mark.parametrize(
@@ -305,6 +418,12 @@ def test_json_pattern(lookup, value, json, expected):
     assert bool(match) is expected
 
 
+def test_json_pattern__invalid_content():
+    request = httpx.Request("POST", "https://foo.bar/", content=b"foo")
+    match = JSON("foo").match(request)
+    assert not match
+
+
 @pytest.mark.parametrize(
     "json,path,value,expected",
     [
@@ -313,16 +432,26 @@ def test_json_pattern(lookup, value, json, expected):
         ({"ham": [{"spam": "spam"}, {"egg": "yolk"}]}, "ham__1__egg", "yolk", True),
         ([{"name": "jonas"}], "0__name", "jonas", True),
         ({"pk": 123}, "pk", 123, True),
+        ({"pk": 1}, "pk", True, False),
+        ({"pk": 1.0}, "pk", 1, False),
+        ({"pk": float("nan")}, "pk", float("nan"), True),
+        ({"x": {"a": 1, "b": [1, 2.5]}}, "x", {"b": [1, 2.5], "a": 1}, True),
+        ({"x": {"a": 1}}, "x", {"b": 1}, False),
+        ({"x": [1, 2]}, "x", (1, 2), True),
+        ({"x": [1, 2]}, "x", [1], False),
         ({"foo": {"bar": "baz"}}, "foo__ham", "spam", KeyError),
         ([{"name": "lundberg"}], "1__name", "lundberg", IndexError),
     ],
 )
-def test_json_pattern_path(json, path, value, expected):
+@pytest.mark.parametrize("stream_threshold", [None, 0])
+def test_json_pattern_path(monkeypatch, json, path, value, expected, stream_threshold):
+    monkeypatch.setattr(JSON, "stream_threshold", stream_threshold)
     request = httpx.Request("POST", "https://foo.bar/", json=json)
     pattern = M(**{f"json__{path}": value})
     if type(expected) is bool:
         match = pattern.match(request)
         assert bool(match) is expected
+        assert (pattern.compile()(RequestView(request)) is not None) is expected
     elif issubclass(expected, Exception):
         with pytest.raises(expected):
             pattern.match(request)
@@ -330,6 +459,61 @@ def test_json_pattern_path(json, path, value, expected):
         raise AssertionError()  # pragma: nocover
 
 
+@pytest.mark.parametrize(
+    "content,path,expected",
+    [
+        (b'{"foo": {}, "ham": "spam"}', "ham", True),
+        (b'{"foo": [], "ham": "spam"}', "ham", True),
+        (b'{"foo": "}", "ham": "spam"', "ham", True),  # Remainder not validated
+        (b'{"ham": "spam", "ham": "egg"}', "ham", True),  # First duplicate key
+        (b'[[1, [2, "]"]], "spam"]', "1", True),
+        (b'{"ham": 1, "foo"}', "foo", False),
+        (b'{"foo": [1, 2}', "ham", False),
+        (b'{"foo": [1, "ham": "spam"', "ham", False),
+        (b'{"foo": , "ham": "spam"}', "ham", False),
+        (b'{foo: "bar", "ham": "spam"}', "ham", False),
+        (b'{"foo": "bar" "ham": "spam"}', "ham", False),
+        (b'{"ham": "spa', "ham", False),
+        (b"{}", "ham", KeyError),
+        (b"[]", "0", IndexError),
+        (b'["spam"]', "1", IndexError),
+        (b'{"0": "spam"}', "0", KeyError),  # Decoded, list index of dict
+    ],
+)
+def test_json_pattern_path__streaming(monkeypatch, content, path, expected):
+    monkeypatch.setattr(JSON, "stream_threshold", len(content))
+    request = httpx.Request("POST", "https://foo.bar/", content=content)
+    view = RequestView(request)
+    pattern = M(**{f"json__{path}": "spam"})
+    if type(expected) is bool:
+        assert bool(pattern.match(view)) is expected
+        assert bool(pattern.match(view)) is expected  # Memoized
+        assert "json" not in vars(view)
+    else:
+        with pytest.raises(expected):
+            pattern.match(view)
+
+
+def test_json_pattern_path__not_streaming_by_default():
+    content = b'{"ham": "spam", "ham": "egg"}' + b" " * 1024 * 1024
+    request = httpx.Request("POST", "https://foo.bar/", content=content)
+    assert JSON.stream_threshold is None
+    assert M(json__ham="egg").match(request)  # Last duplicate key, as decoded
+    assert not M(json__ham="spam").match(request)
+
+    request = httpx.Request("POST", "https://foo.bar/", content=b'{"ham": "spam"')
+    assert not M(json__ham="spam").match(request)  # Validated
+
+
+def test_json_pattern_path__streaming_decoded(monkeypatch):
+    monkeypatch.setattr(JSON, "stream_threshold", 0)
+    request = httpx.Request("POST", "https://foo.bar/", json={"ham": "spam"})
+    view = RequestView(request)
+    assert M(json={"ham": "spam"}).match(view)
+    assert M(json__ham="spam").match(view)
+    assert "json_paths" not in vars(view)
+
+
 def test_invalid_pattern():
     with pytest.raises(KeyError, match="is not a valid Pattern"):
         M(foo="baz")
@@ -396,9 +580,207 @@ def test_merge_patterns():
     merged_pattern = merge_patterns(pattern, path=base)
     assert any([p.base == base for p in iter(merged_pattern)])
 
+    request = httpx.Request("GET", "https://foo.bar/ham/spam/")
+    assert merged_pattern.match(request)
+    request = httpx.Request("GET", "https://foo.bar/spam/")
+    assert not merged_pattern.match(request)
+
+
+def test_request_view():
+    request = httpx.Request(
+        "POST", "https://foo.bar/baz/?ham=spam", json={"egg": "yolk"}
+    )
+    view = RequestView(request)
+    assert RequestView.of(view) is view
+    assert view.headers is request.headers  # Proxied
+    assert view.port == 443
+    assert view.query_items == {("ham", "spam"): 1}
+    assert view.header_items[("content-type", "application/json")] == 1
+
+    # Facets are memoized, and shared by patterns
+    assert view.json is view.json
+    assert M(json__egg="yolk").match(view)
+    assert M(json={"egg": "yolk"}, params={"ham": "spam"}).match(view)
+    assert "json" in vars(view)
+
 
 def test_unique_pattern_key():
     with pytest.raises(TypeError, match="unique key"):
 
         class Foobar(Pattern):
             key = "url"
+
+
+@pytest.mark.parametrize(
+    "pattern,url,context",
+    [
+        (Method("GET") & Host("foo.bar"), "https://foo.bar/", {}),
+        (Method("GET") & Host("ham.spam"), "https://foo.bar/", None),
+        (Method("POST") | Host("foo.bar"), "https://foo.bar/", {}),
+        (Method("GET") | Host("ham.spam"), "https://foo.bar/", {}),
+        (Method("POST") | ~Host("foo.bar"), "https://foo.bar/", None),
+        (~Method("POST"), "https://foo.bar/", {}),
+        (Method(["GET", "POST"], Lookup.IN), "https://foo.bar/", {}),
+        (Host("foo.bar ham.spam", Lookup.IN), "https://foo.bar/", {}),
+        (Host(("foo.bar", ["ham.spam"]), Lookup.IN), "https://foo.bar/", {}),
+        (Port((80, 8080), Lookup.IN), "https://foo.bar/", None),
+        (URL("https://foo.bar/", Lookup.STARTS_WITH), "https://foo.bar/baz/", {}),
+        (
+            M(path__regex=r"^/(?P<slug>\w+)/") & M(host__regex=r"^(?P<sub>\w+)\."),
+            "https://foo.bar/baz/",
+            {"slug": "baz", "sub": "foo"},
+        ),
+        (
+            M(path__regex=r"^/(?P<slug>\w+)/") & Method("GET"),
+            "https://foo.bar/baz/",
+            {"slug": "baz"},
+        ),
+        (Params({"x": "1"}, Lookup.CONTAINS), "https://foo.bar/?x=1&y=2", {}),
+        (Params({"z": "1"}, Lookup.CONTAINS), "https://foo.bar/?x=1&y=2", None),
+        (
+            merge_patterns(Path("/baz/"), path=Path("/api/", Lookup.STARTS_WITH)),
+            "https://foo.bar/api/baz/",
+            {},
+        ),
+        (
+            merge_patterns(Path("/baz/"), path=Path("/api/", Lookup.STARTS_WITH)),
+            "https://foo.bar/baz/",
+            None,
+        ),
+        (
+            merge_patterns(
+                Params({"x": "1"}), params=Params({"y": "2"}, Lookup.CONTAINS)
+            ),
+            "https://foo.bar/?x=1&y=2",
+            {},
+        ),
+    ],
+)
+def test_compile(pattern, url, context):
+    request = httpx.Request("GET", url)
+    match = pattern.match(request)
+    assert (match.context if match else None) == context
+
+    matcher = pattern.compile()
+    assert matcher(RequestView(request)) == context
+
+
+def test_compile__custom_pattern():
+    class Feature(Pattern):
+        key = "feature"
+        lookups = (Lookup.EQUAL, Lookup.CONTAINS)
+
+        def parse(self, request):
+            return request.headers.get("x-feature", "")
+
+        def _contains(self, value):
+            return Match(self.value in value)
+
+        def strip_base(self, value):
+            return value[len(self.base.value) :]
+
+    class Beta(Pattern):
+        key = "beta"
+
+        def match(self, request):
+            return Match(self.value == ("beta" in request.url.host))
+
+    request = httpx.Request("GET", "https://beta.foo.bar/", headers={"x-feature": "ab"})
+    request = RequestView(request)
+    assert Feature("ab").compile()(request) == {}
+    assert Feature("a", Lookup.CONTAINS).compile()(request) == {}
+    assert Feature("x", Lookup.CONTAINS).compile()(request) is None
+    pattern = Feature("b")
+    pattern.base = Feature("a", Lookup.CONTAINS)
+    assert pattern.compile()(request) == {}
+    assert Beta(True).compile()(request) == {}
+    assert Beta(False).compile()(request) is None
+
+
+def test_optimize():
+    pattern = M(method="GET", host="foo.bar") & (Method("GET") & Path("/baz/"))
+    optimized = optimize(pattern)
+    assert optimized.value == (Host("foo.bar"), Method("GET"), Path("/baz/"))
+    assert optimize(Method("GET") & Method("GET")) == Method("GET")
+
+    pattern = (Path("/baz/") | Path("/ham/")) | (Method("GET") | Path("/baz/"))
+    optimized = optimize(pattern)
+    assert optimized.value == (Path("/baz/"), Path("/ham/"), Method("GET"))
+
+    assert optimize(~~Method("GET")) == Method("GET")
+    assert optimize(~(Method("GET") & Method("GET"))) == ~Method("GET")
+
+    # Same pattern with different base are not duplicates
+    based = merge_patterns(Path("/baz/"), path=Path("/api/", Lookup.STARTS_WITH))
+    assert len(optimize(Path("/baz/") & based).value) == 2
+
+    # JSON patterns with different paths are not duplicates
+    pattern = M(json__a=1, json__b=1)
+    assert len(optimize(pattern).value) == 2
+    assert JSON(1, path="a") != JSON(1, path="b")
+    matcher = optimize(pattern).compile()
+    for json, expected in (({"a": 2, "b": 1}, None), ({"a": 1, "b": 1}, {})):
+        request = httpx.Request("POST", "https://foo.bar/", json=json)
+        assert matcher(RequestView(request)) == expected
+
+
+@pytest.mark.parametrize(
+    "pattern,url,context",
+    [
+        (
+            JSON({"foo": "bar"})
+            & M(path__regex=r"/(?P<slug>\w+)/")
+            & M(url__regex=r"/(?P<slug>\w+)/$")
+            & Method("POST"),
+            "https://foo.bar/ham/spam/",
+            {"slug": "spam"},
+        ),
+        (
+            M(url__regex=r"/(?P<slug>\w+)/$") | M(path__regex=r"/(?P<slug>\w+)/"),
+            "https://foo.bar/ham/spam/",
+            {"slug": "spam"},
+        ),
+        (
+            Cookies({"foo": "bar"}) | Path("/ham/spam/") | Method("GET"),
+            "https://foo.bar/ham/spam/",
+            {},
+        ),
+        (Path("/baz/") | Method("GET"), "https://foo.bar/ham/spam/", None),
+    ],
+)
+def test_optimize__compile(pattern, url, context):
+    request = httpx.Request("POST", url, json={"foo": "bar"})
+    match = pattern.match(request)
+    assert (match.context if match else None) == context
+
+    matcher = optimize(pattern).compile()
+    assert matcher(RequestView(request)) == context
+
+
+def test_optimize__short_circuit():
+    request = httpx.Request("GET", "https://foo.bar/", json={"foo": "bar"})
+    pattern = Method("POST") & M(json__ham="spam")
+    assert not pattern.match(RequestView(request))  # No KeyError
+
+    # Cheapest operands are evaluated first
+    view = RequestView(request)
+    pattern = M(json="spam") & (Method("POST") | (Method("PUT") & ~Host("x")))
+    assert optimize(pattern).compile()(view) is None
+    assert "json" not in vars(view)
+
+    # ...though never across a JSON path, which may be missing
+    cookies = Cookies({"a": "b"})
+    json = M(json__ham="spam")
+    operands = (cookies, Method("GET"), json, Path("/"), Host("x"))
+    assert cost_order(operands) == [1, 0, 2, 4, 3]
+    negated = ~(Method("GET") & (Host("x") | M(json__foo="bar")))
+    assert cost_order((cookies, negated, Method("GET"))) == [0, 1, 2]
+    for pattern in (
+        M(json__ham="spam") & Method("POST"),
+        Method("GET") & M(json__ham="spam") & Method("POST"),
+        M(json__ham="spam") | Method("GET"),
+    ):
+        with pytest.raises(KeyError):
+            pattern.match(request)
+        with pytest.raises(KeyError):
+            optimize(pattern).compile()(RequestView(request))
@@ -1,12 +1,15 @@
+import re
 import warnings
+from unittest import mock
 
 import httpcore
 import httpx
 import pytest
 
 from respx import Route, Router
-from respx.models import PassThrough, RouteList
-from respx.patterns import Host, M, Method
+from respx.latency import Empirical, Fixed, LogNormal, Normal, Uniform
+from respx.models import CallList, CallStats, PassThrough, Recording, RouteList
+from respx.patterns import Host, Lookup, M, Method, Pattern
 
 
 @pytest.mark.parametrize(
@@ -40,6 +43,15 @@ def test_resolve(args, kwargs, expected):
         assert resolved.response.status_code == 200  # auto mocked
 
 
+def test_route_match():
+    route = Route(method="GET", path__regex=r"^/(?P<slug>\w+)/$")
+    route.side_effect = lambda request, slug: httpx.Response(200, text=slug)
+
+    response = route.match(httpx.Request("GET", "https://foo.bar/baz/"))
+    assert response.text == "baz"
+    assert route.match(httpx.Request("POST", "https://foo.bar/baz/")) is None
+
+
 def test_pass_through():
     router = Router(assert_all_mocked=False)
     route = router.get("https://foo.bar/", path="/baz/").pass_through()
@@ -141,6 +153,52 @@ def test_mod_response():
         router.route() % []
 
 
+def test_response_template():
+    router = Router()
+    route = router.get("https://foo.bar/").respond(
+        json={"foo": "bar"}, extensions={"http_version": b"HTTP/1.1"}
+    )
+    template = route.return_value
+
+    request1 = httpx.Request("GET", "https://foo.bar/")
+    response1 = router.handler(request1)
+    request2 = httpx.Request("GET", "https://foo.bar/")
+    response2 = router.handler(request2)
+
+    # Clones share body and header items, but not request binding and extensions
+    assert response1 is not template and response1 is not response2
+    assert response1.request is request1 and response2.request is request2
+    assert response1.content is response2.content is template.content
+    assert response1.headers == template.headers
+    assert response1.headers.raw[0][1] is response2.headers.raw[0][1]
+    assert response1.json() == {"foo": "bar"}
+    assert response1.is_closed and response1.num_bytes_downloaded == 14
+
+    response1.headers["X-Foo"] = "bar"
+    response1.extensions["foo"] = "bar"
+    assert "X-Foo" not in response2.headers and "X-Foo" not in template.headers
+    assert response2.extensions == template.extensions == {"http_version": b"HTTP/1.1"}
+
+    # Modified template is re-built
+    template.headers["X-Foo"] = "baz"
+    template.status_code = 201
+    response3 = router.handler(httpx.Request("GET", "https://foo.bar/"))
+    assert response3.status_code == 201
+    assert response3.headers["X-Foo"] == "baz"
+    assert response3.json() == {"foo": "bar"}
+
+    # Streamed template is cloned and read per request
+    route.return_value = httpx.Response(200, content=[b"foo", b"bar"])
+    response4 = router.handler(httpx.Request("GET", "https://foo.bar/"))
+    assert response4.content == b"foobar"
+    assert route._template is None
+
+    route.return_value = httpx.Response(200, stream=httpx.ByteStream(b"foo"))
+    response5 = router.handler(httpx.Request("GET", "https://foo.bar/"))
+    assert response5.content == b"foo"
+    assert route._template is None
+
+
 @pytest.mark.asyncio
 async def test_async_side_effect():
     router = Router()
@@ -155,6 +213,26 @@ async def test_async_side_effect():
     assert response.status_code == 204
 
 
+@pytest.mark.asyncio
+async def test_async_side_effect_no_match():
+    router = Router()
+
+    async def no_match(request):
+        return None
+
+    async def effect(request):
+        return httpx.Response(204)
+
+    route1 = router.get(url__startswith="https://foo.bar/").mock(side_effect=no_match)
+    route2 = router.get("https://foo.bar/").mock(side_effect=effect)
+
+    request = httpx.Request("GET", "https://foo.bar/")
+    response = await router.async_handler(request)
+    assert response.status_code == 204
+    assert not route1.called
+    assert route2.called
+
+
 def test_side_effect_no_match():
     router = Router()
 
@@ -479,3 +557,676 @@ def test_routelist__replaces_same_name_other_pattern_other_name():
     routes.add(foobar2, name="foobar")
     assert list(routes) == [foobar2]
     assert routes["foobar"] is foobar1
+
+
+def test_routelist__index():
+    router = Router(assert_all_mocked=False)
+    route1 = router.get("https://foo.bar/")
+    route2 = router.route(method__in=["GET", "POST"], host="ham.spam")
+    route3 = router.route(host__in="foo.bar ham.spam")  # Substring, not indexed
+    route4 = router.route(host__regex=r"^(foo|ham)\.")
+    route5 = router.route(~Method("GET"))
+    route6 = router.post(host__in=("foo.bar", "ham.spam"), port__in=(443, 8080))
+
+    def candidates(method, url):
+        return router.routes.candidates(httpx.Request(method, url))
+
+    assert candidates("GET", "https://foo.bar/") == [route1, route3, route4, route5]
+    assert candidates("POST", "https://foo.bar/") == [route3, route4, route5, route6]
+    assert candidates("GET", "https://ham.spam/") == [route2, route3, route4, route5]
+    assert candidates("POST", "http://ham.spam/") == [route2, route3, route4, route5]
+    assert candidates("POST", "http://ham.spam:8080/") == [
+        route2,
+        route3,
+        route4,
+        route5,
+        route6,
+    ]
+
+    # Index is kept up to date on changes
+    router.pop("foo", None)
+    route1 = router.post("https://foo.bar/", name="foo")
+    assert candidates("POST", "https://foo.bar/") == [
+        route3,
+        route4,
+        route5,
+        route6,
+        route1,
+    ]
+    assert router.pop("foo") is route1
+    assert candidates("POST", "https://foo.bar/") == [route3, route4, route5, route6]
+
+    router.clear()
+    assert candidates("GET", "https://foo.bar/") == []
+
+    route = router.route()
+    assert candidates("GET", "https://foo.bar/") == [route]
+
+    # Resolves first match in priority order
+    router.clear()
+    route1 = router.route(path="/baz/") % 201
+    route2 = router.get("https://foo.bar/baz/") % 202
+    resolved = router.resolve(httpx.Request("GET", "https://foo.bar/baz/"))
+    assert resolved.route is route1
+
+
+def test_routelist__index_invalidation():
+    router1 = Router()
+    router2 = Router()
+    route1 = router1.get("https://foo.bar/")
+    route2 = router2.get("https://foo.bar/")
+    index1 = router1.routes.index
+    index2 = router2.routes.index
+
+    # Only the route lists of a changed route are invalidated
+    router1.get("https://foo.bar/", name="foo")
+    assert router1.routes.index is not index1
+    assert router2.routes.index is index2
+
+    index1 = router1.routes.index
+    router2.snapshot()
+    router2.get("https://ham.spam/", name="foo")
+    assert route2.name is None and router1.routes.index is index1
+
+    router2.rollback()
+    request = httpx.Request("GET", "https://foo.bar/")
+    assert router2.routes.candidates(request) == [route2]
+    assert router1.routes.index is index1
+
+    # Popped routes are no longer tracked
+    router1.routes.pop("foo")
+    index1 = router1.routes.index
+    route1._set_pattern(M(host="ham.spam"))
+    assert router1.routes.index is index1
+    assert not route1._owners
+
+
+def test_routelist__path_index():
+    router = Router(base_url="https://foo.bar/api/", assert_all_mocked=False)
+    route1 = router.get(path="/baz/")
+    route2 = router.get(path__startswith="/ba")
+    route3 = router.get(path__in=("/ham/", "/spam/"))
+    route4 = router.get("https://ham.spam/api/baz/")
+    route5 = router.get(path__startswith="/b")
+    route6 = router.get(path__in="/ham/")  # Substring, not indexed
+
+    def candidates(url):
+        return router.routes.candidates(httpx.Request("GET", url))
+
+    assert candidates("https://foo.bar/api/baz/") == [route1, route2, route5, route6]
+    assert candidates("https://foo.bar/api/bar/") == [route2, route5, route6]
+    assert candidates("https://foo.bar/api/spam/") == [route3, route6]
+    assert candidates("https://foo.bar/api/egg/") == [route6]
+    assert candidates("https://foo.bar/baz/") == [route6]
+    assert candidates("https://ham.spam/api/baz/") == [route4]
+    assert candidates("https://ham.spam/baz/") == []
+
+    route7 = router.get(path__in=("/egg/", None))  # Non-str, not indexed
+    assert candidates("https://foo.bar/api/egg/") == [route6, route7]
+
+
+def test_routelist__regex_index():
+    router = Router(assert_all_mocked=False)
+    route1 = router.get(r"https://*.foo.bar/")
+    route2 = router.get(path__regex=r"^/baz/(?P<slug>\w+)/$")
+    route3 = router.get(path__regex=r"^/ba\.z?/")
+    route4 = router.get(path__regex=re.compile(r"^/HAM/", re.IGNORECASE))
+    route5 = router.get(path__regex=r"^/(?P<egg>\w+)/(?P=egg)/$")  # Back reference
+    route6 = router.get(path__regex=re.compile(r"^/spam/ # Comment", re.VERBOSE))
+    route7 = router.get(url__regex=r"^https://ham.spam/(?P<slug>\w+)/$")
+
+    def candidates(url):
+        return router.routes.candidates(httpx.Request("GET", url))
+
+    assert candidates("https://egg.foo.bar/") == [route1, route5, route6]
+    assert candidates("https://foo.bar/baz/egg/") == [route2, route5, route6]
+    assert candidates("https://foo.bar/ba./") == [route3, route5, route6]
+    assert candidates("https://foo.bar/ba.z/") == [route3, route5, route6]
+    assert candidates("https://foo.bar/ham/") == [route4, route5, route6]
+    assert candidates("https://ham.spam/egg/") == [route5, route6, route7]
+    assert candidates("https://ham.spam/") == [route5, route6]
+
+    # Context of each route's own named groups
+    resolved = router.resolve(httpx.Request("GET", "https://foo.bar/baz/egg/"))
+    assert resolved.route is route2
+    resolved = router.resolve(httpx.Request("GET", "https://ham.spam/egg/egg/"))
+    assert resolved.route is route5
+
+    # Automatons are compiled per set of prefiltered routes
+    regex_dimension = router.routes.index.dimensions[-2]
+    regex_dimension.automatons.clear()
+    regex_dimension.max_automatons = 1
+    assert candidates("https://foo.bar/ham/") == [route4, route5, route6]
+    assert candidates("https://foo.bar/baz/egg/") == [route2, route5, route6]
+    assert len(regex_dimension.automatons) == 1
+
+    route8 = router.get(url__regex=r"^https://egg")
+    assert candidates("https://egg.foo.bar/") == [route1, route5, route6, route8]
+
+
+@pytest.mark.parametrize(
+    "lookups,url",
+    [
+        ({"path__regex": r"^/foo|/bar"}, "https://foo.bar/zz/bar"),
+        ({"path__regex": r"^/foo|/bar"}, "https://foo.bar/foo"),
+        ({"url__regex": r"^https://a.com|b.com"}, "https://b.com/"),
+        ({"path__regex": r"\A/foo/"}, "https://foo.bar/foo/"),
+    ],
+)
+def test_routelist__regex_index_alternation(lookups, url):
+    router = Router()
+    router.get(path__regex=r"^/ham/")
+    route = router.get(**lookups)
+    request = httpx.Request("GET", url)
+    assert router.routes.candidates(request) == [route]
+    assert router.resolve(request).route is route
+
+
+def test_routelist__unhashable_values():
+    router = Router()
+    route1 = router.get(host__in=["foo.bar", "ham.spam"], port__in=[443, 8443])
+    route2 = router.get(path__in={"/baz/", "/egg/"})
+    assert route1.pattern == M(
+        method="GET", host__in=("foo.bar", "ham.spam"), port__in=(443, 8443)
+    )
+    assert router.get(host__in=["foo.bar", "ham.spam"], port__in=[443, 8443]) is route1
+    assert len(router.routes) == 2
+
+    def resolve(url, **kwargs):
+        return router.resolve(httpx.Request("GET", url, **kwargs)).route
+
+    assert resolve("https://ham.spam/") is route1
+    assert resolve("https://egg.spam/egg/") is route2
+
+
+def test_resolution_cache():
+    router = Router(assert_all_mocked=False, cache_size=2)
+    route1 = router.get("https://foo.bar/", params={"x": "1"}) % 201
+    route2 = router.get("https://foo.bar/", headers={"x-foo": "bar"}) % 202
+    route3 = router.post(cookies={"foo": "bar"}, json={"ham": "spam"}) % 203
+    cache = router._cache
+
+    def resolve(method="GET", url="https://foo.bar/", **kwargs):
+        resolved = router.resolve(httpx.Request(method, url, **kwargs))
+        return resolved.route
+
+    assert resolve(params={"x": "1"}) is route1
+    assert resolve(headers={"x-foo": "bar"}) is route2
+    assert list(cache.entries.values()) == [route1, route2]
+    assert set(cache.facets) == {
+        "scheme",
+        "host",
+        "method",
+        "path",
+        "query_items",
+        "header_items",
+        "cookie_items",
+        "content",
+    }
+
+    # Cache hits
+    with mock.patch.object(router.routes, "candidates", side_effect=AssertionError):
+        assert resolve(params={"x": "1"}) is route1
+    assert list(cache.entries.values()) == [route2, route1]
+    assert route1.call_count == 2
+
+    # Negative cache and LRU eviction
+    assert resolve(url="https://ham.spam/") is None
+    assert list(cache.entries.values()) == [route1, None]
+    assert resolve(url="https://ham.spam/") is None
+
+    json = {"ham": "spam"}
+    assert resolve("POST", cookies={"foo": "bar"}, json=json) is route3
+    assert list(cache.entries.values()) == [None, route3]
+
+    # Invalidated on route changes
+    route4 = router.get(url__regex=r"https://ham.spam/") % 204
+    assert resolve(url="https://ham.spam/") is route4
+    assert list(cache.entries.values()) == [route4]
+
+    router.snapshot()
+    assert not cache.entries
+    assert resolve(url="https://ham.spam/") is route4
+    router.rollback()
+    assert not cache.entries
+
+    # Routes that may decline are not cached
+    route4.side_effect = lambda request: None
+    assert resolve(url="https://ham.spam/") is None
+    route4.side_effect = [httpx.Response(204)]
+    assert resolve(url="https://ham.spam/") is route4
+    route4.side_effect = httpx.Response(204)
+    assert resolve(url="https://ham.spam/") is route4
+    assert list(cache.entries.values()) == [route4]
+
+    # Not cached when no match is asserted
+    router._assert_all_mocked = False
+    with pytest.raises(AssertionError):
+        Router(cache_size=1).resolve(httpx.Request("GET", "https://ham.spam/"))
+
+
+def test_resolution_cache__result_change():
+    router = Router(cache_size=10)
+    route1 = router.get("https://foo.bar/baz/") % 201
+    route2 = router.get(url__startswith="https://foo.bar/") % 202
+
+    def resolve():
+        return router.resolve(httpx.Request("GET", "https://foo.bar/baz/")).route
+
+    assert resolve() is route1
+    assert resolve() is route1
+    assert router._cache.entries
+
+    # Invalidated when a cached route starts to decline
+    route1.side_effect = lambda request: None
+    assert resolve() is route2
+    assert resolve() is route2
+
+    route1.side_effect = None
+    assert resolve() is route1
+    assert list(router._cache.entries.values()) == [route1]
+
+
+def test_resolution_cache__side_effect_traits(tmp_path):
+    path = tmp_path / "foo.txt"
+    path.write_bytes(b"foobar")
+    router = Router(cache_size=10, recording=False)
+    route1 = router.get("https://foo.bar/file/").respond(file=path)
+    route2 = router.get("https://foo.bar/gzip/").respond(
+        text="foobar", encodings=["gzip"]
+    )
+    route3 = Route().mock(side_effect=lambda request: None)
+
+    for route in (route1, route2):
+        assert not route._may_decline() and not route._reads_content()
+    assert route3._may_decline() and route3._reads_content()
+
+    request = httpx.Request("GET", "https://foo.bar/file/", content=b"...")
+    assert not router.reads_content(request)
+    assert not Router(recording=False).reads_content(request)
+    assert Router().reads_content(request)  # Recorded calls keep content
+    assert router.resolve(request).route is route1
+    request = httpx.Request("GET", "https://foo.bar/gzip/")
+    assert router.resolve(request).route is route2
+    assert list(router._cache.entries.values()) == [route1, route2]
+
+
+def test_resolution_cache__result_revision():
+    router1 = Router(cache_size=10)
+    router2 = Router(cache_size=10)
+    route1 = router1.get("https://foo.bar/") % 201
+    route2 = router2.get("https://foo.bar/") % 202
+    request = httpx.Request("GET", "https://foo.bar/")
+    assert router1.resolve(request).route is route1
+    assert router2.resolve(request).route is route2
+
+    # Only the caches of the changed route's router are flushed
+    revision = router2.routes.result_revision
+    route1.respond(203)
+    route1.pass_through(False)
+    assert router2.routes.result_revision == revision
+    assert router2.resolve(request).route is route2
+    assert router2._cache.entries
+
+    # Bumped once per rollback
+    revision = router1.routes.result_revision
+    route1.snapshot()
+    route1.rollback()
+    assert router1.routes.result_revision == revision + 1
+
+
+def test_resolution_cache__custom_pattern():
+    class Canary(Pattern):
+        key = "canary"
+        lookups = (Lookup.EQUAL,)
+
+        def parse(self, request):
+            return "canary" in request.url.host
+
+    router = Router(assert_all_mocked=False, cache_size=10)
+    route = router.route(Canary(True))
+    resolved = router.resolve(httpx.Request("GET", "https://canary.foo.bar/"))
+    assert resolved.route is route
+    assert not router._cache.entries
+
+
+def test_profile():
+    router = Router(assert_all_mocked=False, profile=True)
+    route1 = router.get(params={"x": "1"}, name="ham")
+    route2 = router.get(path__startswith="/foo/").mock(side_effect=lambda request: None)
+    route3 = router.get(host="foo.bar").mock(
+        side_effect=lambda request: httpx.Response(201)
+    )
+    route4 = router.post().mock(side_effect=ValueError)
+    route5 = router.get(host="ham.spam") % 204
+
+    def resolve(method, url):
+        return router.resolve(httpx.Request(method, url)).route
+
+    assert resolve("GET", "https://foo.bar/ham/?x=1") is route1
+    assert resolve("GET", "https://foo.bar/foo/") is route3
+    with pytest.raises(ValueError):
+        resolve("POST", "https://foo.bar/")
+    assert resolve("GET", "https://ham.spam/") is route5
+
+    stats1, stats2, stats3, stats4, stats5 = router.stats()
+    assert stats1.route is route1
+    assert stats1.name == "ham"
+    assert (stats1.evaluated, stats1.matched, stats1.declined) == (3, 1, 0)
+    assert (stats2.evaluated, stats2.matched, stats2.declined) == (1, 1, 1)
+    assert (stats3.evaluated, stats3.matched, stats3.declined) == (1, 1, 0)
+    assert stats4.route is route4
+    assert (stats4.evaluated, stats4.matched, stats4.declined) == (1, 1, 0)
+    assert (stats5.evaluated, stats5.matched, stats5.declined) == (1, 1, 0)
+
+    assert stats1.matching.calls == 3
+    assert stats1.matching.total >= stats1.matching.max > 0
+    assert stats1.matching.p50 <= stats1.matching.p99 == stats1.matching.max
+    assert stats1.side_effect.calls == 0
+    assert stats1.side_effect.total == stats1.side_effect.p50 == 0
+    assert [stats.side_effect.calls for stats in (stats2, stats3, stats4, stats5)] == [
+        1,
+        1,
+        1,
+        0,
+    ]
+
+    # Stale profile of another route with same id
+    router._profiler.profiles[id(route1)] = (route2, router._profiler.get(route2))
+    assert router.stats()[0].evaluated == 0
+
+    router.reset()
+    assert all(stats.evaluated == 0 for stats in router.stats())
+    assert Router().stats() == []
+
+
+@pytest.mark.asyncio
+async def test_profile__async():
+    async def no_match(request):
+        return None
+
+    async def raises(request):
+        raise ValueError()
+
+    async def respond(request):
+        return httpx.Response(201)
+
+    router = Router(assert_all_mocked=False, profile=True)
+    route1 = router.route().mock(side_effect=no_match)
+    route2 = router.get(host="foo.bar").mock(side_effect=raises)
+    route3 = router.get().mock(side_effect=respond)
+
+    assert (await router.aresolve(httpx.Request("GET", "https://ham/"))).route is route3
+    with pytest.raises(ValueError):
+        await router.aresolve(httpx.Request("GET", "https://foo.bar/"))
+
+    stats1, stats2, stats3 = router.stats()
+    assert stats1.route is route1
+    assert (stats1.evaluated, stats1.matched, stats1.declined) == (2, 2, 2)
+    assert stats1.side_effect.calls == 2
+    assert stats2.route is route2
+    assert (stats2.evaluated, stats2.matched, stats2.declined) == (1, 1, 0)
+    assert stats2.side_effect.calls == 1
+    assert (stats3.evaluated, stats3.matched, stats3.declined) == (1, 1, 0)
+
+
+@pytest.mark.parametrize(
+    "latency,expected",
+    [
+        (Fixed(0.5), [0.5, 0.5, 0.5]),
+        (Fixed(-1), [0.0, 0.0, 0.0]),
+        (Uniform(0.1, 0.2, seed=1), [0.1134, 0.1847, 0.1764]),
+        (Normal(0.1, 0.05, seed=1), [0.1644, 0.1725, 0.1033]),
+        (LogNormal(0.1, 0.5, seed=1), [0.1355, 0.0993, 0.185]),
+        (Empirical({50: 0.1, 90: 0.5, 100: 1.0}, seed=1), [0.1, 0.4474, 0.3638]),
+        (Empirical({10: 0.1, 20: 0.2}, seed=2), [0.2, 0.2, 0.1]),
+        (Empirical({90: 1.0, 95: 2.0}, seed=1), [1.0, 1.0, 1.0]),
+    ],
+)
+def test_latency_models(latency, expected):
+    samples = [round(latency.sample(), 4) for _ in range(3)]
+    assert samples == expected
+
+
+def test_latency_models__invalid():
+    with pytest.raises(ValueError, match="at least one percentile"):
+        Empirical({})
+    with pytest.raises(ValueError, match="within 0-100"):
+        Empirical({50: 0.1, 101: 0.2})
+    with pytest.raises(TypeError, match="Latency must be"):
+        Route().latency = "fast"
+
+
+def test_latency():
+    router = Router(assert_all_mocked=False, latency=0.1)
+    route1 = router.get("https://foo.bar/")
+    route1.latency = Fixed(0.2)
+    route2 = router.post("https://foo.bar/")
+    route3 = router.get("https://ham.spam/").pass_through()
+
+    with mock.patch("time.sleep") as sleep:
+        router.handler(httpx.Request("GET", "https://foo.bar/"))
+        router.handler(httpx.Request("POST", "https://foo.bar/"))
+        router.handler(httpx.Request("DELETE", "https://foo.bar/"))
+        with pytest.raises(PassThrough):
+            router.handler(httpx.Request("GET", "https://ham.spam/"))
+
+    assert sleep.call_args_list == [mock.call(0.2), mock.call(0.1), mock.call(0.1)]
+    assert route1.calls.latencies == [0.2]
+    assert route2.calls.latencies == [0.1]
+    assert route3.calls.latencies == [None]
+    assert router.calls.latencies == [0.2, 0.1, 0.1, None]
+    assert not hasattr(router.calls.last, "__dict__")
+
+    # Latency is rolled back with route state
+    router.snapshot()
+    route2.latency = 0
+    router.handler(httpx.Request("POST", "https://foo.bar/"))
+    assert route2.calls.latencies == [0.1, 0]
+    router.rollback()
+    assert route2.latency is None
+    assert route2.calls.latencies == [0.1]
+    assert CallList(route2.calls).latencies == [0.1]
+    route2.calls.clear()
+    assert route2.calls.latencies == []
+
+    # Not mocked request fails without delay
+    router = Router(latency=0.1)
+    with mock.patch("time.sleep") as sleep:
+        with pytest.raises(AssertionError, match="not mocked"):
+            router.handler(httpx.Request("GET", "https://foo.bar/"))
+    sleep.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_latency__async():
+    router = Router()
+    route = router.get("https://foo.bar/")
+    route.latency = Uniform(0.01, 0.02, seed=1)
+
+    with mock.patch("time.sleep") as sleep:
+        response = await router.async_handler(httpx.Request("GET", "https://foo.bar/"))
+    sleep.assert_not_called()
+
+    assert response.status_code == 200
+    assert route.calls.latencies == [pytest.approx(0.0113, abs=1e-4)]
+    request, response = route.calls.last
+    assert request.url == "https://foo.bar/"
+
+
+def test_recording_off():
+    router = Router(assert_all_mocked=False, recording=False)
+    route = router.get("https://foo.bar/")
+    router.snapshot()
+
+    with mock.patch("respx.models.Call") as Call:
+        for _ in range(3):
+            router.handler(httpx.Request("GET", "https://foo.bar/"))
+        router.handler(httpx.Request("POST", "https://foo.bar/"))
+    Call.assert_not_called()
+
+    assert route.called and route.call_count == 3
+    assert router.calls.called and router.calls.call_count == 4
+    assert route.calls.last is None and len(route.calls) == 0
+    route.calls.assert_called()
+    router.calls.assert_called()
+
+    router.rollback()
+    assert not route.called and router.calls.call_count == 0
+
+    router.handler(httpx.Request("GET", "https://foo.bar/"))
+    router.snapshot()
+    router.reset()
+    assert not route.called and route.call_count == 0
+    router.rollback()
+    assert route.call_count == router.calls.call_count == 1
+
+
+@pytest.mark.parametrize(
+    "recording,expected_kept",
+    [
+        (Recording(maxlen=3), [7, 8, 9]),
+        (Recording(sample=3), [3, 6, 9]),
+        (Recording(sample=4, maxlen=1), [8]),
+        (Recording(sample=1.0), list(range(1, 10))),
+        (Recording(sample=0.0), []),
+        (Recording(sample=lambda call: call.request.url.params["n"] > "6"), [7, 8, 9]),
+        (Recording(maxlen=0), []),
+    ],
+)
+def test_recording_policy(recording, expected_kept):
+    router = Router(recording=recording)
+    route = router.get("https://foo.bar/")
+
+    for n in range(1, 10):
+        router.handler(httpx.Request("GET", f"https://foo.bar/?n={n}"))
+
+    assert router.calls.recording is recording
+    for calls in (router.calls, route.calls):
+        kept = [int(call.request.url.params["n"]) for call in calls]
+        assert kept == expected_kept
+        assert calls.latencies == [None] * len(kept)
+        assert calls.call_count == 9
+        assert calls.called
+        assert calls.last.request.url.params["n"] == "9"
+
+    # Snapshots keep counts and last call
+    router.snapshot()
+    router.reset()
+    assert route.call_count == 0 and route.calls.last is None
+    router.rollback()
+    assert route.call_count == 9
+    assert route.calls.last.request.url.params["n"] == "9"
+
+
+def test_recording_policy__fraction():
+    calls = CallList(recording=Recording(sample=0.3, seed=1))
+    for n in range(1, 10):
+        calls.record(httpx.Request("GET", f"https://foo.bar/?n={n}"), None)
+
+    assert [int(call.request.url.params["n"]) for call in calls] == [1, 4, 9]
+    assert calls.call_count == 9
+
+
+@pytest.mark.parametrize("sample", [0.5, 2])
+def test_recording_policy__sampled_once(sample):
+    router = Router(recording=Recording(sample=sample, seed=1))
+    route1 = router.get("https://foo.bar/")
+    route2 = router.post("https://foo.bar/")
+
+    for n in range(1, 21):
+        method = "GET" if n % 3 else "POST"
+        router.handler(httpx.Request(method, f"https://foo.bar/?n={n}"))
+
+    # Route lists keep the very calls kept by the router
+    assert 0 < len(router.calls) < 20
+    for route in (route1, route2):
+        assert route.calls == [
+            call for call in router.calls if route.match(call.request) is not None
+        ]
+
+
+def test_recording_policy__invalid():
+    with pytest.raises(ValueError, match="at least 1"):
+        Recording(sample=0)
+    with pytest.raises(ValueError, match="within 0-1"):
+        Recording(sample=1.5)
+
+
+def test_call_stats():
+    router = Router(assert_all_mocked=False, recording=Recording(maxlen=1))
+    route = router.post("https://foo.bar/", name="foo").respond(201, text="created")
+    error_route = router.get("https://foo.bar/error").mock(
+        side_effect=httpx.ConnectError
+    )
+    router.route(host="pass.through").pass_through()
+    router.snapshot()
+
+    with mock.patch("time.time", side_effect=[10.0, 11.0, 12.0, 13.0, 14.0]):
+        for _ in range(2):
+            router.handler(httpx.Request("POST", "https://foo.bar/", content=b"abc"))
+        with pytest.raises(httpx.ConnectError):
+            router.handler(httpx.Request("GET", "https://foo.bar/error"))
+        with pytest.raises(PassThrough):
+            router.handler(httpx.Request("GET", "https://pass.through/"))
+        router.handler(
+            httpx.Request(
+                "PUT",
+                "https://foo.bar/unmocked",
+                headers={"Content-Length": "5"},
+                stream=httpx.ByteStream(b"hello"),
+            )
+        )
+
+    assert len(route.calls) == 1
+    assert route.calls.stats.count == 2
+    assert route.calls.stats.methods == {"POST": 2}
+    assert route.calls.stats.statuses == {201: 2}
+    assert route.calls.stats.request_bytes == 6
+    assert route.calls.stats.response_bytes == 14
+    assert (route.calls.stats.first, route.calls.stats.last) == (10.0, 11.0)
+
+    assert error_route.calls.stats.count == 1
+    assert error_route.calls.stats.exceptions == {httpx.ConnectError: 1}
+    assert not error_route.calls.stats.statuses
+
+    stats = router.calls.stats
+    assert stats.count == router.calls.call_count == 5
+    assert stats.methods == {"POST": 2, "GET": 2, "PUT": 1}
+    assert stats.statuses == {201: 2, 200: 1}
+    assert stats.exceptions == {httpx.ConnectError: 1}
+    assert stats.request_bytes == 11
+    assert stats.response_bytes == 14
+    assert (stats.first, stats.last) == (10.0, 14.0)
+
+    router.rollback()
+    assert router.calls.stats.count == route.calls.stats.count == 0
+    assert route.calls.stats.first is None and not route.calls.stats.methods
+
+    router.handler(httpx.Request("POST", "https://foo.bar/"))
+    router.snapshot()
+    router.reset()
+    assert router.calls.stats.count == route.calls.stats.count == 0
+    router.rollback()
+    assert router.calls.stats.count == route.calls.stats.count == 1
+    assert route.calls.stats.statuses == {201: 1}
+
+
+def test_call_stats__recording_off():
+    router = Router(recording=False)
+    route = router.get("https://foo.bar/")
+    router.handler(httpx.Request("GET", "https://foo.bar/"))
+    assert len(route.calls) == 0
+    assert route.calls.stats.count == router.calls.stats.count == 1
+    assert route.calls.stats.statuses == {200: 1}
+
+
+def test_call_stats__unread_content():
+    stats = CallStats()
+    stream = httpx.ByteStream(b"foo")
+    stats.update(
+        httpx.Request("POST", "https://foo.bar/", stream=stream),
+        httpx.Response(200, headers={"Content-Length": "invalid"}, stream=stream),
+    )
+    assert stats.count == 1 and stats.first == stats.last is not None
+    assert stats.request_bytes == stats.response_bytes == 0